@@ -10,15 +10,40 @@ https://github.com/kenseehart/btypes
 
 
 import unittest
-from typing import Union, Any, Callable, Sequence, Iterator
+from typing import Union, Any, Callable, Sequence, Iterator, Iterable
 from pprint import pprint as std_pprint
 import json
 import re
+from types import FunctionType
+from array import array as pyarray
+from itertools import chain
+from weakref import WeakValueDictionary
+import sys
 from random import randint, seed, choice
 
-from btypes.expressions import CSTNode, cst_expr, cst_source_code, cst_uint, is_identifier
+from btypes.expressions import cst_expr, cst_uint, src_expr, src_uint
 from btypes.numduck import IntDuck, NumDuck
 
+try:
+    import orjson # optional, faster json parsing
+except ImportError:
+    orjson = None
+
+try:
+    import numpy # optional, see btype.decode_batch_
+except ImportError:
+    numpy = None
+
+
+def json_loads(s:Union[str, bytes]) -> Any:
+    '''json.loads, using orjson if it is installed'''
+    if orjson:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError: # e.g. integers wider than 64 bits
+            pass
+    return json.loads(s)
+
 _all_above_excluded = set(locals().keys())
 
 # everything defined below this will be exported to the btypes package unless startswith('_')
@@ -26,6 +51,21 @@ _all_above_excluded = set(locals().keys())
 r_hex = re.compile(r'^\s*(?:0x|0X)?([0-9a-fA-F]+)(?:[Uu]?[Ll]{1,2}|H|h)?\s*$')
 r_bin = re.compile(r'^\s*(?:0b|0B)?([01]+)(?:[Uu]?[Ll]{1,2})?\s*$')
 
+_r_hex_match = r_hex.fullmatch # bound once, see _parse_int
+_r_bin_match = r_bin.fullmatch
+
+def _parse_int(s:str, base:int, fullmatch:Callable) -> int:
+    '''return s parsed as a base 2 or 16 integer in the forms accepted by fullmatch (_r_bin_match or _r_hex_match), or None'''
+    if s.isascii() and s.isalnum() and s[-1] not in 'LlUuHh': # digits with an optional 0b/0x prefix, int() parses these
+        try:
+            return int(s, base)
+        except ValueError:
+            pass # not a number, fall through to the regex for consistent errors
+    m = fullmatch(s)
+    return int(m.group(1), base) if m else None
+
+_expr_fns = {} # {closed form source: compiled function}, see field.expr_field_
+
 def enum(a: Union[list, str]) -> dict:
     '''return an enum_ dict given an iterable'''
     return {c:i for i, c in enumerate(a)}
@@ -58,6 +98,7 @@ def field_method(f):
 class unbound_field(type):
     '''Unbound field implementing propery protocol'''
     btype_: 'btype'
+    dim_: int
     v_: Any
 
     def __init__(self, name, bases, dict_):
@@ -78,33 +119,59 @@ class unbound_field(type):
         '''description string'''
         return f'{type(self.btype_).__name__} {self.__name__}'
 
+    def __call__(self, target_field: 'field' = None) -> 'field':
+        '''bind a field to the target of target_field, or to a new target list consisting of a single integer'''
+        # sets the target_ slot directly: a Python __init__ and field.__setattr__ would triple the cost of every binding
+        f = _new(self)
+        # a list cell holding an unbounded int: cheaper to index than array('Q'), and not limited to 64 bits
+        _set_target(f, target_field.target_ if target_field is not None else [0])
+        _set_subfields(f, None)
+        return f
+
     def __get__(self, instance, owner):
         if instance is None: # unbound field
             return self
-        return self(instance) # return the binding of this field to the target
+        return _bound(instance, self)
 
     def __set__(self, instance, value):
-        self(instance).v_ = value
+        self._set_v(_bound(instance, self), value) # the v_ setter, called directly instead of through field.__setattr__
+
+    def _element(self, i:int) -> 'unbound_field':
+        '''return the unbound field of array element i, allocated on first use'''
+        f = self._elements[i]
+        if f is None:
+            et = self.etype_
+            f = self._elements[i] = et.allocate_(f'{self.__name__}._{i}', self, self.offset_ + et.size_*(self.dim_-1-i))
+            setattr(self, f'_{i}', f)
+        return f
+
+    def _set_elements(self, instance:'field', values:Iterable):
+        '''assign values to elements 0, 1, ... of instance through their descriptors, without field.__setattr__'''
+        elements = self._elements
+        for i, v in enumerate(values):
+            if i >= len(elements):
+                raise IndexError(f'{self.desc_}: more than {len(elements)} values assigned')
+            (elements[i] or self._element(i)).__set__(instance, v)
 
     def __getitem__(self, k):
         if isinstance(k, int):
+            if self.dim_ is not None:
+                if 0 <= k < self.dim_:
+                    return self._elements[k] or self._element(k)
+                raise IndexError(f'{self.desc_} index {k} out of range')
             try:
                 return getattr(self, f'_{k}')
             except AttributeError as e:
-                if self.btype_.dim_ is not None:
-                    raise IndexError(f'{self.desc_} index {k} out of range') from e
                 raise TypeError(f'{self.desc_} is not subscriptable') from e
 
         elif isinstance(k, slice):
-            if self.btype_.dim_ is not None:
-                fname = f'{k.start}_{k.stop}_{k.step}'
-                try:
-                    return getattr(self, fname)
-                except AttributeError:
+            if self.dim_ is not None:
+                key = (k.start, k.stop, k.step)
+                f = self._slice_cache.get(key) # no exception on the cold path
+                if f is None:
                     ft = bslice(self.btype_, k)
-                    f = ft.allocate_(f'{self.__name__}.{fname}', self)
-                    setattr(self, fname, f)
-                    return f
+                    f = self._slice_cache[key] = ft.allocate_(f'{self.__name__}.{k.start}_{k.stop}_{k.step}', self)
+                return f
             else:
                 raise TypeError(f'{self.desc_} is not subscriptable')
         else:
@@ -115,17 +182,17 @@ class unbound_field(type):
 
 
     def __iter__(self):
-        if self.btype_.dim_ is None:
+        if self.dim_ is None:
             raise TypeError(f'{self.desc_} is not iterable')
 
-        for i in range(self.btype_.dim_):
+        for i in range(self.dim_):
             yield self[i]
 
     def __len__(self):
-        if self.btype_.dim_ is None:
+        if self.dim_ is None:
             raise TypeError(f'{self.desc_} has no len()')
 
-        return self.btype_.dim_
+        return self.dim_
 
 
     @property
@@ -134,55 +201,114 @@ class unbound_field(type):
         return self
 
     @field_method
-    def cst_(self, expr: str = '', word_size: int = 0) -> CSTNode:
+    def cst_(self, expr: str = '', word_size: int = 0) -> 'CSTNode':
         '''Return a CSTNode for this field, or an expression
         '''
-        if expr == '':
-            return cst_uint(self.offset_, self.mask_, word_size)
-        else:
-            def resolver(s: str, word_size=word_size) -> CSTNode:
-                return self[s].cst_('', word_size)
+        cache = type(self)._cst_cache # CSTNodes are immutable, so they are shared by all bindings
+        key = (expr, word_size)
+        cst = cache.get(key)
 
-            return cst_expr(expr, resolver, word_size)
+        if cst is None:
+            if expr == '':
+                cst = cst_uint(self.offset_, self.mask_, word_size)
+            else:
+                def resolver(s: str, word_size=word_size) -> 'CSTNode':
+                    return self[s].cst_('', word_size)
+
+                cst = cst_expr(expr, resolver, word_size)
+            cache[key] = cst
+
+        return cst
 
 
     @field_method
     def expr_(self, expr: str = '', word_size: int = 0) -> str:
-        'return low-level source code string for this field'
-        return cst_source_code(self.cst_(expr, word_size))
+        'return low-level source code string for this field, or an expression, assembled without building a cst'
+        cache = type(self)._src_cache
+        key = (expr, word_size)
+        src = cache.get(key)
+
+        if src is None:
+            if expr == '':
+                src = src_uint(self.offset_, self.mask_, word_size)
+            else:
+                def resolver(s: str) -> str:
+                    f = self
+                    for k in s.split('.'):
+                        f = f[k]
+                    return f.expr_('', word_size)
+
+                src = src_expr(expr, resolver)
+            cache[key] = src
+
+        return src
 
     @field_method
     def expr_field_(self, expr: str, word_size: int = 0) -> str:
         ''''return a field that implements the specified expression with this field as the namespace
         Security Warning: do not use unless the source of expr is trusted
         '''
+        cache = type(self)._expr_cache
+        key = (expr, word_size)
+        fnf = cache.get(key)
+        if fnf is not None:
+            return fnf
 
-        cst = self.cst_(expr, word_size)
-        src = cst_source_code(cst)
-        d = {}
+        src = self.expr_(expr, word_size)
 
         # possibly insecure:
-        exec('def fn(n: int):\n    return '+src, d, d) # pylint: disable=exec-used
+        # the closed form only refers to n and integer literals, so it needs no globals or builtins,
+        # and equal source (same expression at the same offsets, e.g. of equal schemas) shares one compiled function
+        fn = _expr_fns.get(src)
+        if fn is None:
+            fn = _expr_fns[src] = eval(compile('lambda n: '+src, '<btypes expr>', 'eval'), {'__builtins__': {}}) # pylint: disable=eval-used
 
-        fnf = fn_type(d['fn'], src).allocate_('<expr>', self)
+        fnf = fn_type(fn, src).allocate_('<expr>', self)
         fnf.expr_ = lambda *a: src
+        cache[key] = fnf
 
         return fnf
 
+    @field_method
+    def vmap_(self, n: Any, expr: str = '') -> Any:
+        '''evaluate the raw value of this field, or of an expression with this field as the namespace,
+        for root record(s) n
+
+        n may be an int, a list or tuple of ints (returns a list),
+        or an array of records such as numpy.ndarray(dtype=uint64) for batch evaluation
+        Security Warning: do not use unless the source of expr is trusted
+        '''
+        fn = self.expr_field_(expr).fn_
+        if isinstance(n, (list, tuple)):
+            return list(map(fn, n))
+        return fn(n)
+
+    @field_method
+    def filter_(self, n: Iterable[int], expr: str) -> list:
+        '''return the root records in n for which an expression with this field as the namespace is true
+        e.g. seven.filter_(raw_data, 'a == 3')
+        the expression is compiled into the filtering loop, no field is bound and no function is called per record
+        Security Warning: do not use unless the source of expr is trusted
+        '''
+        cache = type(self)._expr_cache
+        key = (expr, 'filter_') # expr_field_ keys are (expr, word_size)
+        scan = cache.get(key)
+        if scan is None:
+            src = f'lambda records: [n for n in records if {self.expr_(expr)}]'
+            scan = cache[key] = eval(compile(src, '<btypes filter>', 'eval'), {'__builtins__': {}}) # pylint: disable=eval-used
+        return scan(n)
+
 
 class field(IntDuck, metaclass=unbound_field):
-    '''Bound field'''
+    '''Bound field
+    bindings have slots and no __dict__: attributes other than n_, v_ and subfields can not be set on them,
+    keep user data alongside the field instead (f._note = 1 raises AttributeError)
+    '''
+    __slots__ = ('target_', '_subfields') # _subfields: {unbound_field: binding} of subfields read, see _bound
     offset_: int
     mask_: int
     name_: str
 
-    def __init__(self, target_field: 'field' = None):
-        '''bind a field to a target list consisting of a single integer'''
-        if target_field is not None:
-            self.target_ = target_field.target_
-        else:
-            self.target_ = [0]
-
     def __repr__(self):
         return f'<{repr(self.v_)}>'
 
@@ -194,8 +320,8 @@ class field(IntDuck, metaclass=unbound_field):
     @n_.setter
     def n_(self, n: int):
         '''set the raw integer value (signed or unsigned)'''
-        self.target_[0] = (self.target_[0] & ~(self.mask_ << self.offset_) |
-                           ((n&self.mask_) << self.offset_))
+        t = self.target_
+        t[0] = t[0] & self._clear_mask | ((n & self.mask_) << self.offset_)
 
     @property
     def v_(self) -> Any:
@@ -210,31 +336,28 @@ class field(IntDuck, metaclass=unbound_field):
     @property
     def bin_(self) -> str:
         '''return binary string representation (0 padded to correct length, no prefix)'''
-        return ('0'*self.size_ + bin(self.n_)[2:])[-self.size_:]
+        return format(self.n_, f'0{self.size_}b')
 
     @bin_.setter
     def bin_(self, s: str):
         '''read binary string, ignore the usual prefixes and suffixes, truncate overflow'''
-        m = r_bin.fullmatch(s)
-        if m:
-            self.n_ = int(m.group(1), 2)
-        else:
+        n = _parse_int(s, 2, _r_bin_match)
+        if n is None:
             raise ValueError(f'Expected binary string, got "{s}"')
+        self.n_ = n
 
     @property
     def hex_(self) -> str:
         '''return hex string representation (0 padded to correct length, no prefix)'''
-        hsize = (self.size_+3)//4
-        return ('0'*hsize + hex(self.n_)[2:])[-hsize:]
+        return format(self.n_, f'0{(self.size_+3)//4}x')
 
     @hex_.setter
     def hex_(self, s: str):
         '''read hex string, ignore the usual prefixes and suffixes, truncate overflow'''
-        m = r_hex.fullmatch(s)
-        if m:
-            self.n_ = int(m.group(1), 16)
-        else:
+        n = _parse_int(s, 16, _r_hex_match)
+        if n is None:
             raise ValueError(f'Expected hex string, got "{s}"')
+        self.n_ = n
 
     @property
     def json_(self):
@@ -244,65 +367,341 @@ class field(IntDuck, metaclass=unbound_field):
     @json_.setter
     def json_(self, s):
         '''read json string'''
-        self.v_ = json.loads(s)
+        self.v_ = json_loads(s)
+
+    @property
+    def bytes_(self) -> bytes:
+        '''return the raw value as big endian bytes (the first field is in the first byte)'''
+        return self.n_.to_bytes((self.size_+7)//8, 'big')
+
+    @bytes_.setter
+    def bytes_(self, b:bytes):
+        '''set the raw value from big endian bytes'''
+        if len(b) != (self.size_+7)//8:
+            raise ValueError(f'{type(self).desc_}: expected {(self.size_+7)//8} bytes, got {len(b)}')
+        self.n_ = int.from_bytes(b, 'big')
+
+    def __bytes__(self):
+        return self.bytes_
+
+    def read_(self, path:str) -> Any:
+        '''return the value of the subfield at a btype_.layout_ path (e.g. 'bars[3].a') without binding intermediate fields'''
+        z, mask, decode, _ = self.btype_._access[path]
+        return decode((self.target_[0] >> (self.offset_ + z)) & mask)
+
+    def write_(self, path:str, v:Any):
+        '''set the subfield at a btype_.layout_ path (e.g. 'bars[3].a') like an assignment to its v_,
+        a partial dict or list assigned to a struct or array leaves the other members
+        '''
+        z, mask, _, assign = self.btype_._access[path]
+        z += self.offset_
+        t = self.target_
+        n = t[0]
+        t[0] = n & ~(mask << z) | ((assign((n >> z) & mask, v) & mask) << z)
 
     def __bool__(self):
-        return self.n_ != 0
+        return (self.target_[0] >> self.offset_) & self.mask_ != 0
 
     def __len__(self):
-        return self.btype_.dim_
+        return self.dim_
 
     # comparison
     def __eq__(self, other): # pylint: disable=too-many-return-statements
-        if isinstance(other, int):
+        if isinstance(other, int): # exact ints are compared before falling back here, see _int_ops
             return int(self) == other
 
         if isinstance(other, str):
             return str(self) == other
 
-        if isiter(other):
-            if len(self) == len(other):
-                for sv, ov in zip(self, other):
-                    if sv != ov:
-                        return False
-                else:
-                    return True
-            else:
+        if isiter(other) and self.dim_ is not None:
+            if len(self) != len(other):
                 return False
+            bt = self.btype_
+            if type(bt) is array:
+                # decode all the elements at once instead of binding and comparing each element
+                et = bt.etype_
+                other = list(other)
+                if _plain_int(et) and all(isinstance(ov, (int, str)) for ov in other):
+                    # an element equals a str if its str() does, and an int if int() does, which is the enum value of a name
+                    enum = et.enum_
+                    return all(str(v) == ov if isinstance(ov, str) else (enum[v] if type(v) is str else v) == ov
+                               for v, ov in zip(bt.decode_(self.n_), other))
+                if type(et).decode_ is struct.decode_ and all(type(ov) is dict for ov in other):
+                    return bt.decode_(self.n_) == other
+            for sv, ov in zip(self, other):
+                if sv != ov:
+                    return False
+            return True
 
         if isinstance(other, field):
-            return self.n_ == other.n_
+            if type(self).__hash__ is None or type(other).__hash__ is None or self.btype_ is other.btype_:
+                return self.n_ == other.n_
+            return self.v_ == other.v_ # hashable fields hash their value: sint(4) -1 is not uint(4) 15
 
         return self.v_ == other
 
+    # a field equals values of several types (an enum field its name and its number, a struct field a dict),
+    # no hash agrees with all of them, so only fields of a plain number hash, see btype._hash_accessor
+    __hash__ = None
+
     def __int__(self): # may be overloaded (e.g. sint support for negatives)
-        return self.n_
+        return (self.target_[0] >> self.offset_) & self.mask_ # n_ inlined
+
+    __index__ = __int__ # skip IntDuck.__index__ -> int(self) -> __int__, rebind wherever __int__ is overloaded
 
     def __str__(self):
         return str(self.v_)
 
     def __setitem__(self, k, v):
         if isinstance(k, int):
-            k = f'_{k}' # array elements as field property instances
-
-        setattr(self, k, v)
+            self[k].v_ = v # array elements are allocated on first use
+        else:
+            setattr(self, k, v)
 
     def __setattr__(self, k, v):
-        if k[0]=='_' or k[-1]=='_' or hasattr(self, k):
-            super().__setattr__(k, v)
+        settable = type(self)._settable
+        if k in settable: # names that passed the checks below before, one set lookup
+            _object_setattr(self, k, v)
+        elif k[0]=='_' or k[-1]=='_' or k in type(self).__dict__: # subfields are allocated into the unbound field
+            if k[0]=='_' and k[1:].isdigit() and self.dim_ is not None and int(k[1:]) < self.dim_:
+                type(self)._element(int(k[1:])) # array elements are allocated on first use
+            _object_setattr(self, k, v)
+            settable.add(k)
         else:
             msg = f'{type(self)} does not have attribute {k}'
-            if hasattr(self, k+'_'):
-                msg += ': did you mean {k}_ ?'
+            if hasattr(type(self), k+'_'): # class lookup only, no __getattr__ fallback
+                msg += f': did you mean {k}_ ?'
             raise AttributeError(msg)
 
     def __getattr__(self, k):
+        cache = type(self)._attr_cache
+        try:
+            return cache[k]
+        except KeyError:
+            pass
+        if k[0]=='_' and k[1:].isdigit() and self.dim_ is not None and int(k[1:]) < self.dim_:
+            return type(self)._element(int(k[1:]))(self) # array element not yet allocated
         try:
-            return getattr(self.btype_, k)
+            v = cache[k] = getattr(self.btype_, k) # btype attributes are fixed once the field is allocated
+            return v
         except AttributeError as e:
             raise AttributeError(f"'{self.name_}' field has no attribute '{k}'") from e
 
-class btype(type):
+_new = object.__new__
+_object_setattr = object.__setattr__
+
+def _n_accessors(offset:int, mask:int, is_root:bool, root_size:int) -> tuple:
+    '''return (getter, setter) of n_ for a field, offset and mask are bound as closure constants'''
+    if is_root and offset == 0:
+        # a root field owns its whole target and needs no shift or clear mask
+        def get(self) -> int:
+            return self.target_[0] & mask
+        def put(self, n:int):
+            self.target_[0] = n & mask
+        return get, put
+
+    if root_size > 64 and 2*offset + mask.bit_length() < root_size:
+        # low half of a wide target: t >> offset would copy the whole upper part, t & shifted only the lower part
+        shifted = mask << offset
+        def get(self) -> int:
+            return (self.target_[0] & shifted) >> offset
+    else:
+        def get(self) -> int:
+            return (self.target_[0] >> offset) & mask
+
+    if root_size > 2048:
+        # a very wide target: flip the changed bits with one xor over the target instead of clearing and or-ing
+        # (two operations over the target), the old value is read with get, which copies only one side of it
+        def put(self, n:int):
+            t = self.target_
+            t[0] ^= ((get(self) ^ n) & mask) << offset
+        return get, put
+
+    clear = ~(mask << offset)
+    def put(self, n:int):
+        t = self.target_
+        t[0] = t[0] & clear | ((n & mask) << offset)
+    return get, put
+
+def _setattr_v(f:field, v:Any):
+    f.v_ = v
+
+def _plain_int(bt:'btype') -> bool:
+    '''True if bt decodes like a uint or sint, to the integer or its enum name, see btype._plain_decode'''
+    return type(bt).decode_ in (uint.decode_, sint.decode_) and bt._plain_decode
+
+def _machine_typecode(bt:'btype') -> str:
+    '''return the array.array typecode holding values of bt if they are plain machine size integers, else None'''
+    if _plain_int(bt) and not bt.renum_ and bt.size_ in (8, 16, 32, 64):
+        codes = 'bhilq' if isinstance(bt, sint) else 'BHILQ'
+        return next((c for c in codes if pyarray(c).itemsize*8 == bt.size_), None)
+    return None
+
+def _left_bytes(n:int, size:int) -> bytes:
+    '''n of size bits as big endian bytes, shifted left to a whole byte so that bit size-1 starts the first byte'''
+    pad = -size % 8
+    return (n << pad).to_bytes((size+pad)//8, 'big')
+
+def _fuse_v(ftype:unbound_field, decode:Callable[[int], Any]):
+    '''replace the v_ getter of ftype with decode(n_), skipping the btype_.decode_ indirection'''
+    get = ftype.n_.fget
+    v = ftype.v_
+    ftype.v_ = property(lambda self: decode(get(self)), v.fset, doc=v.__doc__)
+
+def _fuse_json(ftype:unbound_field, bt:'struct'):
+    '''replace the json_ getter of ftype with bt._json(n_), which writes the text directly instead of building v_ for json.dumps'''
+    j = ftype.json_
+    if j is not field.json_:
+        return
+    get = ftype.n_.fget
+    ftype.json_ = property(lambda self: bt._json(get(self)), j.fset, doc=j.__doc__)
+
+def _batch_column(x:'numpy.ndarray', z:int, size:int) -> 'numpy.ndarray':
+    '''bits z..z+size-1 of a numpy array of raw values, as uint64 if they fit, see btype.decode_batch_'''
+    column = x >> z if z else x.copy()
+    if x.dtype == object or z + size < 64: # the top field of a uint64 needs no mask
+        column &= (1<<size)-1 # in place, one temporary per column
+    return column.astype(numpy.uint64) if x.dtype == object and size <= 64 else column
+
+class SoAView:
+    '''a batch of records of a btype as columns, see btype.view_soa_
+    subfields are decoded with numpy on first access and cached, a struct subfield is a nested SoAView
+    '''
+    __slots__ = ('btype_', 'n_', '_columns')
+
+    def __init__(self, bt:'btype', n:'numpy.ndarray'):
+        self.btype_ = bt
+        self.n_ = n # raw values, uint64 or object if wider than 64 bits
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.n_)
+
+    def __repr__(self):
+        return f'<SoAView {self.btype_} x {len(self.n_)}>'
+
+    @property
+    def v_(self) -> Any:
+        '''all the records decoded, see btype.decode_batch_'''
+        return self.btype_._decode_batch(self.n_)
+
+    def __getitem__(self, path:str) -> Any:
+        '''the column of the subfield at a btype_.layout_ path (e.g. 'bars[3].a')'''
+        columns = self._columns
+        v = columns.get(path)
+        if v is None:
+            try:
+                z, ft = self.btype_.layout_[path]
+            except (KeyError, AttributeError) as e:
+                raise KeyError(f'{self.btype_} has no subfield {path}') from e
+            if type(ft).decode_ is struct.decode_:
+                v = columns[path] = SoAView(ft, _batch_column(self.n_, z, ft.size_))
+            else:
+                v = columns[path] = ft._decode_batch_at(self.n_, z)
+        return v
+
+    def __getattr__(self, k):
+        try:
+            return self[k]
+        except KeyError as e:
+            raise AttributeError(f'{self.btype_} has no field {k}') from e
+
+def _text_accessors(get:Callable[[field], int], size:int) -> dict:
+    '''bin_ and hex_ properties for a field class whose n_ getter is get, with the format specs as closure constants'''
+    bin_spec = f'0{size}b'
+    hex_spec = f'0{(size+3)//4}x'
+    def bin_(self) -> str:
+        return format(get(self), bin_spec)
+    def hex_(self) -> str:
+        return format(get(self), hex_spec)
+    return {'bin_': property(bin_, field.bin_.fset, doc=field.bin_.__doc__),
+            'hex_': property(hex_, field.hex_.fset, doc=field.hex_.__doc__)}
+
+def _int_ops(get:Callable[[field], int], to_str:Callable[[field], Any]=None) -> dict:
+    '''IntDuck arithmetic, ordering and int equality for a field class whose int() is get, calling get directly instead of through int()
+    str equality goes through to_str if given, the v_ getter of a field class whose str() is str(v_)
+    '''
+    def __add__(self, other):
+        return get(self) + other
+    def __radd__(self, other):
+        return other + get(self)
+    def __sub__(self, other):
+        return get(self) - other
+    def __rsub__(self, other):
+        return other - get(self)
+    def __mul__(self, other):
+        return get(self) * other
+    def __rmul__(self, other):
+        return other * get(self)
+    def __floordiv__(self, other):
+        return get(self) // other
+    def __rfloordiv__(self, other):
+        return other // get(self)
+    def __lt__(self, other):
+        return get(self) < int(other)
+    def __gt__(self, other):
+        return get(self) > int(other)
+    def __le__(self, other):
+        return get(self) <= int(other)
+    def __ge__(self, other):
+        return get(self) >= int(other)
+    def __eq__(self, other):
+        if type(other) is int:
+            return get(self) == other
+        if to_str and type(other) is str:
+            return str(to_str(self)) == other
+        return field.__eq__(self, other)
+    return {k: v for k, v in locals().items() if k not in ('get', 'to_str')}
+
+_set_target = field.__dict__['target_'].__set__ # slot descriptor, see unbound_field.__call__
+_set_subfields = field.__dict__['_subfields'].__set__
+
+def _bound(instance:field, ftype:unbound_field) -> field:
+    '''the binding of subfield ftype to the target of instance, repeated reads through instance reuse it
+    the bindings are kept by instance, not by ftype, so they do not outlive it or keep its target alive,
+    and a binding never changes its target, so threads sharing instance may share them (a race only binds twice)
+    '''
+    cache = instance._subfields
+    if cache is None: # first subfield read through instance
+        cache = {}
+        _set_subfields(instance, cache)
+    f = cache.get(ftype)
+    if f is None:
+        f = cache[ftype] = _new(ftype) # ftype(instance) inlined
+        _set_target(f, instance.target_)
+        _set_subfields(f, None)
+    return f
+
+def _freeze(v:Any) -> Any:
+    '''a hashable key for a btype constructor argument, enum dicts become tuples of their items'''
+    if isinstance(v, dict):
+        return (dict, tuple((k, _freeze(x)) for k, x in v.items()))
+    if isinstance(v, (list, tuple)):
+        return (type(v), tuple(map(_freeze, v)))
+    return (type(v), v) # uint(4, {'a': True}) is not uint(4, {'a': 1})
+
+class interned_btype(type):
+    '''metaclass of btype, a btype class that sets _interned = True is a flyweight:
+    constructing it again with equal arguments (e.g. uint(4)) returns the same instance
+    an interned btype is shared by every user of those arguments, so it is immutable once constructed:
+    assigning a public attribute (e.g. uint(4).enum_ = ...) raises AttributeError, see btype.__setattr__
+    '''
+    _instances = WeakValueDictionary()
+
+    def __call__(cls, *args, **kwargs):
+        if not cls.__dict__.get('_interned'): # not inherited, a subclass may construct with side effects
+            return super().__call__(*args, **kwargs)
+        try:
+            key = (cls, _freeze(args), _freeze(kwargs))
+            bt = cls._instances.get(key)
+        except TypeError: # unhashable argument
+            return super().__call__(*args, **kwargs)
+        if bt is None:
+            bt = cls._instances[key] = super().__call__(*args, **kwargs)
+            bt._frozen = True
+        return bt
+
+class btype(type, metaclass=interned_btype):
     '''Base class for field metatypes'''
     repr_: str
     size_: int
@@ -315,74 +714,434 @@ class btype(type):
         return self
 
 
+    def __setattr__(self, k:str, v:Any):
+        # private attributes are caches built on first use (e.g. _layout), the same for every user
+        if k[0] != '_' and self.__dict__.get('_frozen'):
+            raise AttributeError(f'{self} is interned and shared, {k} can not be assigned: construct a btype with it instead')
+        super().__setattr__(k, v)
+
     def __call__(self, value:int=0) -> field:
         'Create a new bound interface from this btype'
-        ufield = self.allocate_(self.name_)
+        ufield = self.__dict__.get('_root_field') # instances of a btype share one allocated root
+        if ufield is None:
+            ufield = self._root_field = self.allocate_(self.name_)
         f = ufield()
         f.v_ = value
         return f
 
+    def unpack_(self, buf:bytes) -> list:
+        '''return a list of bound fields from a buffer of packed records, see field.bytes_'''
+        nbytes = (self.size_+7)//8
+        if len(buf) % nbytes:
+            raise ValueError(f'{self}: buffer length {len(buf)} is not a multiple of the record size {nbytes}')
+        mv = memoryview(buf) # slices without copying
+        return [self(int.from_bytes(mv[i:i+nbytes], 'big')) for i in range(0, len(buf), nbytes)]
+
+    def unpack_values_(self, buf:bytes) -> list:
+        '''return the values (v_) of a buffer of packed records, same as [f.v_ for f in unpack_(buf)] without binding fields'''
+        nbytes = (self.size_+7)//8
+        if len(buf) % nbytes:
+            raise ValueError(f'{self}: buffer length {len(buf)} is not a multiple of the record size {nbytes}')
+        typecode = _machine_typecode(self)
+        if typecode:
+            a = pyarray(typecode, buf) # records are machine integers, unpack in C
+            if sys.byteorder == 'little':
+                a.byteswap()
+            return a.tolist()
+        mv = memoryview(buf)
+        decode, from_bytes = self._v_decode, int.from_bytes
+        return [decode(from_bytes(mv[i:i+nbytes], 'big')) for i in range(0, len(buf), nbytes)]
+
+    def where_(self, values:Iterable[int], path:str, v:Any) -> list:
+        '''return the raw integers (n_) in values whose subfield at a layout_ path equals v, without binding fields
+        e.g. quest_struct.where_(raw_data, 'parrot.status', 'dead')
+        '''
+        z, mask, _, assign = self._access[path]
+        n = assign(0, v) & mask
+        return [x for x in values if (x >> z) & mask == n]
+
+    def columns_(self, values:Iterable[int]) -> dict:
+        '''return {path: [value, ...]} for each leaf subfield of the raw integers (n_) in values, without binding fields
+        leaves are fields that do not decode as a dict or list of their subfields, e.g. uint, sint, and utf8 strings
+        '''
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        columns = {}
+        leaf = None
+        for p, (z, mask, decode, _) in self._access.items():
+            if leaf and p.startswith(leaf): # subfield of a leaf, e.g. a byte of a utf8 string
+                continue
+            ft = self.layout_[p][1]
+            if isinstance(ft, struct) and type(ft).decode_ in (struct.decode_, array.decode_):
+                continue
+            leaf = (p + '[', p + '.')
+            columns[p] = [decode((x >> z) & mask) for x in values]
+        return columns
+
+    def decode_batch_(self, values:Iterable[int]) -> Any:
+        '''decode the raw integers (n_) of many records at once with numpy, subfields are numpy arrays of one column each
+        a struct decodes to {name: column}, and an array of integers to a 2-D array with a row per record
+        requires numpy: pip install numpy
+        '''
+        return self.view_soa_(values).v_
+
+    def view_soa_(self, values:Iterable[int]) -> 'SoAView':
+        '''return a view of the raw integers (n_) of many records, whose subfields are numpy columns decoded on first use
+        e.g. quest_struct.view_soa_(raw_data).parrot.status, or quest_struct.view_soa_(raw_data)['knights[1].name']
+        requires numpy: pip install numpy
+        '''
+        if numpy is None:
+            raise ImportError('view_soa_ requires numpy: pip install numpy')
+        return SoAView(self, numpy.asarray(values, dtype=numpy.uint64 if self.size_ <= 64 else object))
+
+    def from_buffer_(self, buf, offset:int=0) -> field:
+        '''return a bound field from the record at byte offset of a buffer (bytes, bytearray, memoryview, mmap...)'''
+        nbytes = (self.size_+7)//8
+        if offset < 0 or offset + nbytes > len(buf):
+            raise ValueError(f'{self}: buffer of {len(buf)} bytes has no record at offset {offset}')
+        return self(int.from_bytes(memoryview(buf)[offset:offset+nbytes], 'big'))
+
+    def pack_(self, values:Iterable) -> bytes:
+        '''return a buffer of packed records from values or fields of this btype, the inverse of unpack_'''
+        nbytes = (self.size_+7)//8
+        return b''.join((v.n_ if isinstance(v, field) else self(v).n_).to_bytes(nbytes, 'big') for v in values)
+
     def allocate_(self, name:str, parent:unbound_field=None, offset:int=0) -> field:
         'allocate a unbound_field of this btype, into the specified parent if specified, else allocate as the interface root'
 
         if type(self) is btype:
             raise TypeError('btype is a virtual class and can not be allocated')
 
-        ufield = unbound_field(name or self.repr_, (type(self).mixin_field_,), {}) #pylint: disable=no-member
-        ufield.parent_ = parent
+        mixin = type(self).mixin_field_ #pylint: disable=no-member
+        # copy public btype attributes (enum_, signbit_, etype_, fn_, ...) into the class so they resolve
+        # without the __getattr__ fallback, which remains for properties and attributes assigned later
+        ns = {k: staticmethod(v) if isinstance(v, FunctionType) else v
+              for k, v in vars(self).items() if k[0] != '_' and k[-1] == '_' and not hasattr(mixin, k)}
+        mask = (1<<self.size_)-1
+        ns.update(__slots__=(), parent_=parent, size_=self.size_, mask_=mask, offset_=offset, _clear_mask=~(mask << offset),
+                  btype_=self, dim_=self.dim_) # class constants, e.g. len() and indexing need not go through btype_
+        for k in ('decode_', 'encode_'): # bound to this btype, so mixin getters and setters call self.decode_ directly
+            if not hasattr(mixin, k):
+                ns[k] = getattr(self, k)
+        if mixin.n_ is field.n_: # not overloaded by the mixin
+            get, put = _n_accessors(offset, mask, parent is None, parent.root_.size_ if parent else self.size_)
+            ns['n_'] = property(get, put, doc=field.n_.__doc__)
+            ns.update((k, p) for k, p in _text_accessors(get, self.size_).items() if getattr(mixin, k) is getattr(field, k))
+            to_v = self._v_accessor(mixin, get)
+            if to_v:
+                ns['v_'] = property(to_v, mixin.v_.fset, doc=mixin.v_.__doc__)
+            to_int = self._int_accessor(mixin, get)
+            if to_int:
+                ns['__int__'] = ns['__index__'] = to_int
+                to_str = to_v if mixin.__str__ is field.__str__ else None
+                ns.update((k, op) for k, op in _int_ops(to_int, to_str).items() if getattr(mixin, k) is getattr(field, k))
+        # always set: a namespace defining __eq__ (see _int_ops) without __hash__ would get __hash__ = None
+        ns['__hash__'] = self._hash_accessor(mixin, ns.get('__int__'))
+        ns.update(_cst_cache={}, _src_cache={}, _expr_cache={}, _attr_cache={}, _slice_cache={},
+                  _settable={'n_', 'v_'}) # see field.__setattr__
+        v = mixin.v_
+        ns['_set_v'] = staticmethod(v.fset if isinstance(v, property) and v.fset else _setattr_v) # see unbound_field.__set__
+        # one class creation with a complete namespace, setting dunders afterwards would update type slots one by one
+        ufield = unbound_field(name or self.repr_, (mixin,), ns)
         ufield.root_ = parent.root_ if parent else ufield
-        ufield.size_ = self.size_
-        ufield.mask_ = ((1<<self.size_)-1)
-        ufield.offset_ = offset
-        ufield.btype_ = self
         return ufield
 
+    def _int_accessor(self, mixin:type, get:Callable[[field], int]) -> Callable[[field], int]:
+        '''return int() for fields of this btype given the n_ getter of the field class, or None to keep mixin.__int__'''
+        return get if mixin.__int__ is field.__int__ else None
+
+    def _v_accessor(self, mixin:type, get:Callable[[field], int]) -> Callable[[field], Any]:
+        '''return the v_ getter for fields of this btype given the n_ getter of the field class, or None to keep mixin.v_'''
+        return None
+
+    def _hash_accessor(self, mixin:type, to_int:Callable[[field], int]) -> Callable[[field], int]:
+        '''return __hash__ for fields of this btype given their int() if the field class has a fast one,
+        or None to make them unhashable, default mixin.__hash__ (field.__hash__ is None, see field.__eq__)
+        '''
+        return mixin.__hash__
+
+    def decode_(self, n:int) -> Any:
+        '''return the value (v_) of a field of this btype given its raw unsigned integer n
+        virtual: overload along with mixin_field_.v_ (default=int)
+        '''
+        return n
+
+    def encode_(self, v:Any) -> int:
+        '''return the raw integer (n_) of a field of this btype given a value v, the inverse of decode_
+        virtual: overload along with mixin_field_.v_ (default=int)
+        '''
+        return v
+
+    @property
+    def _plain_decode(self) -> bool:
+        '''True if the decode_ of this btype is the one of its class, so _decode_src, _json_src and _decode_batch may
+        inline or vectorize it, overload along with them (a subclass overloading decode_ or the v_ getter of
+        mixin_field_ falls back to _v_decode)
+        '''
+        return False
+
+    def _stock_decode(self, cls:type) -> bool:
+        '''True if neither decode_ nor the mixin_field_.v_ getter of this btype is overloaded from those of cls'''
+        t = type(self)
+        return t.decode_ is cls.decode_ and t.mixin_field_.v_.fget is cls.mixin_field_.v_.fget
+
+    @property
+    def _decodes_v(self) -> bool:
+        '''False if mixin_field_ overloads the v_ getter below the btype class that defines decode_
+        (e.g. a uint subclass whose fields read as strings), then decode_(n) is not the v_ of a field
+        '''
+        owner = next(c for c in type(self).__mro__ if 'decode_' in c.__dict__)
+        return type(self).mixin_field_.v_.fget is getattr(owner, 'mixin_field_', field).v_.fget
+
+    @property
+    def _v_decode(self) -> Callable[[int], Any]:
+        '''decode_, or the v_ getter of a field set to n if decode_ does not give it (see _decodes_v), built on first use
+        the fallback of the generated decoders, so a struct or array of such fields decodes to their v_
+        '''
+        decode = self.__dict__.get('_v_decode_fn')
+        if decode is None:
+            if self._decodes_v:
+                decode = self.decode_
+            else:
+                ft = self.allocate_(self.name_)
+                get = ft.v_.fget
+                def decode(n:int) -> Any:
+                    # a binding per call, not one shared by every caller, so decoding is thread safe
+                    f = _new(ft)
+                    _set_target(f, [n])
+                    _set_subfields(f, None)
+                    return get(f)
+            self._v_decode_fn = decode
+        return decode
+
+    @property
+    def _encodes_v(self) -> bool:
+        '''likewise False if mixin_field_ overloads the v_ setter below the btype class that defines encode_'''
+        owner = next(c for c in type(self).__mro__ if 'encode_' in c.__dict__)
+        return type(self).mixin_field_.v_.fset is getattr(owner, 'mixin_field_', field).v_.fset
+
+    @property
+    def _v_assign(self) -> Callable[[int, Any], int]:
+        '''function of (n, v), the n_ of a field holding n after v is assigned to its v_, built on first use
+        encode_(v) for a leaf whose v_ setter is encode_ (see _encodes_v), otherwise the v_ setter of a field is called,
+        which merges a partial dict or list into a struct or array as assigning v_ does
+        '''
+        assign = self.__dict__.get('_v_assign_fn')
+        if assign is None:
+            if self._encodes_v and not isinstance(self, struct):
+                encode = self.encode_
+                def assign(n:int, v:Any) -> int: # pylint: disable=unused-argument
+                    return encode(v)
+            else:
+                ft = self.allocate_(self.name_)
+                put_v = ft.v_.fset
+                def assign(n:int, v:Any) -> int:
+                    t = [n] # a binding per call, as in _v_decode
+                    f = _new(ft)
+                    _set_target(f, t)
+                    _set_subfields(f, None)
+                    put_v(f, v)
+                    return t[0]
+            self._v_assign_fn = assign
+        return assign
+
+    def _decode_src(self, z:int, env:dict) -> str:
+        '''return the source of an expression that decodes the bits of n at offset z,
+        names it refers to are added to env, see struct.decode_
+        overload to inline the decode of simple btypes
+        '''
+        k = f'decode{len(env)}'
+        env[k] = self._v_decode
+        return f'{k}((n >> {z}) & {(1<<self.size_)-1:#x})'
+
+    def _json_src(self, z:int, env:dict) -> str:
+        '''like _decode_src, an expression that returns the json text of the bits of n at offset z, see struct._json'''
+        src = self._decode_src(z, env)
+        k = f'dumps{len(env)}'
+        env[k] = json.dumps
+        return f'{k}({src})'
+
+    def _decode_batch(self, x:'numpy.ndarray') -> Any:
+        '''decode a numpy array of raw values of this btype, see decode_batch_
+        overload to vectorize the decode of simple btypes
+        '''
+        return numpy.array(list(map(self._v_decode, x.tolist())))
+
+    def _decode_batch_at(self, x:'numpy.ndarray', z:int) -> Any:
+        '''decode bits z..z+size_-1 of a numpy array of raw values, see decode_batch_
+        overload to fuse the column extraction into the decode
+        '''
+        return self._decode_batch(_batch_column(x, z, self.size_))
+
+    @property
+    def layout_(self) -> dict:
+        '''flat table {path: (offset, btype)} of all subfields, offsets relative to this btype
+        paths look like 'a', 'bars[3]', 'bars[3].a'
+        '''
+        layout = self.__dict__.get('_layout')
+        if layout is None:
+            layout = self._layout = {path: (z, ft) for path, z, ft in self._walk('', 0)}
+        return layout
+
+    @property
+    def _access(self) -> dict:
+        '''layout_ with the arithmetic done, {path: (offset, mask, _v_decode, _v_assign)}, see field.read_'''
+        access = self.__dict__.get('_access_table')
+        if access is None:
+            access = self._access_table = {p: (z, (1<<ft.size_)-1, ft._v_decode, ft._v_assign) for p, (z, ft) in self.layout_.items()}
+        return access
+
+    def _walk(self, path:str, offset:int) -> Iterator[tuple]:
+        '''yield (path, offset, btype) for all subfields, depth first'''
+        return iter(())
+
     def __repr__(self):
         return self.repr_
 
     def __getitem__(self, n):
-        return array(self, n)
+        # array types are shared per element type and dim, constructing one compiles its decoder
+        arrays = self.__dict__.get('_arrays')
+        if arrays is None:
+            arrays = self._arrays = {}
+        a = arrays.get(n)
+        if a is None:
+            a = arrays[n] = array(self, n)
+        return a
 
 class uint(btype):
     '''unsigned integer with optional enum'''
+    _interned = True # uint(4) is uint(4), see interned_btype
 
     def __init__(self, size:int, enum_:dict=None, name=None):
         super().__init__(name)
         self.size_ = size
         self.repr_ = f"{type(self).__name__}({size})"
-        self.enum_ = enum_ or {}
-        self.renum_ = {v:k for k,v in self.enum_.items()}
+        self.enum_ = dict(enum_) if enum_ else {} # a copy, since an interned uint is shared
+        # decoded names are interned, so comparing to a literal (status == 'dead') usually matches by identity
+        self.renum_ = {v: sys.intern(k) if type(k) is str else k for k,v in self.enum_.items()}
+        # small enums decode by indexing a table of every raw value, larger ones fall back to renum_.get
+        self._decode_lut = tuple(self.renum_.get(i, i) for i in range(1<<size)) if self.renum_ and size <= 8 else None
+        # likewise small enums encode names and numeric strings with one lookup, names take precedence
+        self._encode_str = {**{str(i): i for i in range(1<<size)}, **self.enum_} if self.enum_ and size <= 8 else self.enum_
+
+    def decode_(self, n:int) -> Union[int, str]:
+        lut = self._decode_lut
+        if lut:
+            return lut[n]
+        renum = self.renum_
+        return renum.get(n, n) if renum else n # defaults to raw int if enum is not defined
+
+    @property
+    def _plain_decode(self) -> bool:
+        return self._stock_decode(uint)
+
+    def _decode_src(self, z:int, env:dict) -> str:
+        if not self._plain_decode or (self.renum_ and not self._decode_lut): # a large enum has no table to index
+            return super()._decode_src(z, env)
+        x = f'((n >> {z}) & {(1<<self.size_)-1:#x})'
+        if self._decode_lut:
+            k = f'lut{len(env)}'
+            env[k] = self._decode_lut
+            return f'{k}[{x}]'
+        return x
+
+    def _decode_batch(self, x:'numpy.ndarray') -> Any:
+        if not self._plain_decode or (self.renum_ and not self._decode_lut):
+            return super()._decode_batch(x)
+        if self._decode_lut:
+            return numpy.array(self._decode_lut, dtype=object)[x.astype(numpy.intp)]
+        return x
+
+    def _json_src(self, z:int, env:dict) -> str:
+        if not self._plain_decode or (self.renum_ and not self._decode_lut):
+            return super()._json_src(z, env)
+        x = f'((n >> {z}) & {(1<<self.size_)-1:#x})'
+        if self._decode_lut: # enum names pre-quoted
+            k = f'jlut{len(env)}'
+            env[k] = tuple(json.dumps(v) for v in self._decode_lut)
+            return f'{k}[{x}]'
+        return f'str({x})'
+
+    def encode_(self, v:Union[int, str]) -> int:
+        if type(v) is int: # the common case, skip the str checks
+            return v
+        if isinstance(v, str):
+            n = self._encode_str.get(v)
+            if n is None:
+                try:
+                    n = int(v)
+                except ValueError:
+                    raise ValueError(f'{self}: undefined enum {v}')
+            return n
+        return v
+
+    @property
+    def _byte_lut(self) -> tuple:
+        '''(decoded elements packed in byte b, ...) for b in range(256), for arrays of 1, 2, 4 or 8 bit elements, built on first use'''
+        lut = self.__dict__.get('_byte_lut_table')
+        if lut is None:
+            size = self.size_
+            mask = (1<<size)-1
+            lut = self._byte_lut_table = tuple(tuple(self.decode_((b >> z) & mask) for z in range(8-size, -1, -size))
+                                               for b in range(256))
+        return lut
+
+    def _v_accessor(self, mixin:type, get:Callable[[field], int]) -> Callable[[field], Any]:
+        if mixin.v_ is not uint.mixin_field_.v_ or not _plain_int(self):
+            return None
+        if not self.renum_:
+            return self._int_accessor(mixin, get) # no enum, v_ is int(self)
+        decode = self._decode_lut.__getitem__ if self._decode_lut else self.decode_
+        def v_(self):
+            return decode(get(self))
+        return v_
+
+    def _hash_accessor(self, mixin:type, to_int:Callable[[field], int]) -> Callable[[field], int]:
+        if mixin.__hash__ is not uint.mixin_field_.__hash__:
+            return mixin.__hash__
+        if self.renum_: # equal to its name and to its number
+            return None
+        if to_int is None:
+            return mixin.__hash__
+        def __hash__(self):
+            return hash(to_int(self))
+        return __hash__
 
     class mixin_field_(field):
         '''inherited by bound field instance'''
+        __slots__ = ()
+        def __hash__(self):
+            '''hash of int(self), consistent with equality to ints, enum fields are unhashable (see uint._hash_accessor)
+            like the value, the hash changes when the field is assigned: do not mutate a field used as a key
+            '''
+            return hash(int(self))
+
         @property
         def v_(self) -> Union[int, str]:
             v = int(self)
-            try:
-                v = self.btype_.renum_[v] # defaults to raw int if enum is not defined
-            except KeyError:
-                pass
-            return v
+            lut = self.btype_._decode_lut
+            if lut:
+                return lut[v]
+            renum = self.renum_ # copied into the field class by allocate_
+            return renum.get(v, v) if renum else v # defaults to raw int if enum is not defined
 
         @v_.setter
         def v_(self, v:Union[int, str]):
-
-            if isinstance(v, str):
-                try:
-                    v = self.btype_.enum_[v]
-                except KeyError:
-                    try:
-                        v = int(v)
-                    except ValueError:
-                        raise ValueError(f'{self}: undefined enum {v}')
-
-            self.n_ = v
+            self.n_ = self.encode_(v)
 
 class svreg(uint):
     '''uint with system verilog slice semantics'''
+    _interned = True
+
+    def decode_(self, n:int) -> int:
+        return n
+
+    def encode_(self, v:int) -> int:
+        return v
 
     class mixin_field_(field):
         '''inherited by bound field instance'''
+        __slots__ = ()
+        __hash__ = uint.mixin_field_.__hash__
 
         def __getitem__(self, k:slice):
             'return a bound field using SV slice semantics'
@@ -404,14 +1163,71 @@ class svreg(uint):
 
 class sint(uint):
     '''signed integer with optional enum'''
+    _interned = True
+
+    def __init__(self, size:int, enum_:dict=None, name=None):
+        super().__init__(size, enum_, name)
+        self.signbit_ = 1<<(size-1) # sign extension of n is (n ^ signbit_) - signbit_
+        self._decode_lut = None # renum_ is keyed by signed values
+
+    def decode_(self, n:int) -> Union[int, str]:
+        sb = self.signbit_
+        n = (n ^ sb) - sb
+        renum = self.renum_
+        return renum.get(n, n) if renum else n
+
+    @property
+    def _plain_decode(self) -> bool:
+        return self._stock_decode(sint)
+
+    def _decode_src(self, z:int, env:dict) -> str:
+        if not self._plain_decode or self.renum_: # through uint's, which falls back for either, to btype's
+            return super()._decode_src(z, env)
+        return f'(((n >> {z}) & {(1<<self.size_)-1:#x}) ^ {self.signbit_:#x}) - {self.signbit_:#x}'
+
+    def _decode_batch(self, x:'numpy.ndarray') -> Any:
+        if not self._plain_decode or self.renum_:
+            return super()._decode_batch(x)
+        return self._signed_batch(x)
+
+    def _decode_batch_at(self, x:'numpy.ndarray', z:int) -> Any:
+        if not self._plain_decode or self.renum_:
+            return super()._decode_batch_at(x, z)
+        return self._signed_batch(x, z)
+
+    def _signed_batch(self, x:'numpy.ndarray', z:int=0) -> 'numpy.ndarray':
+        '''sign extend bits z..z+size_-1 of a numpy array of raw values'''
+        if x.dtype == object: # wider than 64 bits
+            x = _batch_column(x, z, self.size_)
+            if x.dtype == object:
+                return (x ^ self.signbit_) - self.signbit_
+            z = 0
+        # the sign bit is shifted to bit 63 and back, which also drops the bits above and below the field
+        y = x.view(numpy.int64) << (64 - z - self.size_)
+        y >>= 64 - self.size_
+        return y
+
+    def _json_src(self, z:int, env:dict) -> str:
+        if not self._plain_decode or self.renum_:
+            return super()._json_src(z, env)
+        return f'str({self._decode_src(z, env)})'
+
+    def _int_accessor(self, mixin:type, get:Callable[[field], int]) -> Callable[[field], int]:
+        if mixin.__int__ is not sint.mixin_field_.__int__:
+            return None
+        sb = self.signbit_
+        def to_int(self):
+            return (get(self) ^ sb) - sb
+        return to_int
 
     class mixin_field_(uint.mixin_field_):
         '''inherited by bound field instance'''
+        __slots__ = ()
         def __int__(self):
-            v = self.n_
-            if v&(1<<(self.size_-1)):
-                v = v - (1<<(self.size_))
-            return v
+            sb = self.signbit_ # copied into the field class by allocate_
+            return (self.n_ ^ sb) - sb
+
+        __index__ = __int__
 
 class fixed(sint):
     '''fixed point encoded as signed integer with const divisor
@@ -423,26 +1239,76 @@ class fixed(sint):
     precision = number of fractional digits
     base = base of digits
     '''
+    _interned = True
 
     def __init__(self, size:int, precision: int, base:int, name=None):
-        super().__init__(name)
+        super().__init__(size, name=name)
+        self.repr_ = f"fixed({size}, {precision}, {base})"
         self.precision_ = precision
         self.base_ = base
         self.divisor_ = base**precision
-        self.size_ = size
         self.max_ = ((1<<size)-1)/self.divisor_
         self.min_ = -self.max_
 
+    def decode_(self, n:int) -> float:
+        sb = self.signbit_
+        return ((n ^ sb) - sb)/self.divisor_
+
+    @property
+    def _plain_decode(self) -> bool:
+        return self._stock_decode(fixed)
+
+    def _decode_src(self, z:int, env:dict) -> str:
+        if not self._plain_decode:
+            return super()._decode_src(z, env)
+        return f'((((n >> {z}) & {(1<<self.size_)-1:#x}) ^ {self.signbit_:#x}) - {self.signbit_:#x}) / {self.divisor_}'
+
+    def _decode_batch(self, x:'numpy.ndarray') -> Any:
+        if not self._plain_decode:
+            return super()._decode_batch(x)
+        return self._signed_batch(x) / self.divisor_
+
+    def _decode_batch_at(self, x:'numpy.ndarray', z:int) -> Any:
+        if not self._plain_decode:
+            return super()._decode_batch_at(x, z)
+        return self._signed_batch(x, z) / self.divisor_
+
+    def encode_(self, v:float) -> int:
+        try:
+            if v<self.min_ or v>self.max_:
+                raise ValueError(f'{self}: value {v} out of range {self.min_} <= value <= {self.max_}')
+        except TypeError as e:
+            raise TypeError(f"{self} doesn't support assignment of {type(v)}") from e
+        return int(v*self.divisor_)
+
+    def _v_accessor(self, mixin:type, get:Callable[[field], int]) -> Callable[[field], float]:
+        if mixin.v_ is not fixed.mixin_field_.v_ or mixin.__float__ is not fixed.mixin_field_.__float__:
+            return None
+        sb, divisor = self.signbit_, self.divisor_
+        def v_(self): # NumDuck arithmetic goes through v_
+            return ((get(self) ^ sb) - sb)/divisor
+        return v_
+
     class mixin_field_(NumDuck, sint.mixin_field_):
         '''inherited by bound field instance'''
+        __slots__ = ()
         def __int__(self):
             return int(float(self))
 
+        __index__ = __int__
+
         def __float__(self):
-            v = self.n_
-            if v&(1<<(self.size_-1)):
-                v = v - (1<<(self.size_))
-            return v/self.divisor_
+            sb = self.signbit_ # class attributes copied from btype_
+            return ((self.n_ ^ sb) - sb)/self.divisor_
+
+        def __eq__(self, other):
+            if isinstance(other, (int, float)): # compared as float, int(self) would truncate 1.5 to 1
+                return float(self) == other
+            return field.__eq__(self, other)
+
+        def __hash__(self):
+            '''hash of float(self), consistent with equality to floats (and to ints, which hash like equal floats)'''
+            return hash(float(self))
 
         @property
         def v_(self) -> float:
@@ -450,12 +1316,7 @@ class fixed(sint):
 
         @v_.setter
         def v_(self, v:float):
-            try:
-                if v<self.min_ or v>self.max_:
-                    raise ValueError(f'{type(self).desc_}: value {v} out of range {self.min_} <= value <= {self.max_}')
-            except TypeError as e:
-                raise TypeError(f"{type(self).desc_} doesn't support assignment of {type(v)}")
-            self.n_ = int(v*self.divisor_)
+            self.n_ = self.encode_(v) # range checked by fixed.encode_, bound to btype_ by allocate_
 
 
 
@@ -465,6 +1326,7 @@ class decimal(fixed):
     decimal(16, 2) = 16 bits, 2 decimal places (-655.35 <= v <= 655.36)
     decoded values (self.v_) are float
     '''
+    _interned = True
 
     def __init__(self, size:int, precision:int, name=None):
         super().__init__(size, precision, 10, name=name)
@@ -479,28 +1341,135 @@ class struct(btype):
 
     def __init__(self, name, fields):
         self.name_ = name
-        self.fields_ = fields
+        self.fields_ = tuple(fields) # also accepts dict items, see metastruct
         self.size_ = sum(f.size_ for _,f in self.fields_)
 
+        # (name, btype, offset) of each field relative to the struct, last field (offset 0) first, see allocate_
+        self._children = []
+        z = 0
+        for fname, ft in reversed(self.fields_):
+            if fname.endswith('_'):
+                raise ValueError(f'Field names must not end with _: {fname}')
+            self._children.append((fname, ft, z))
+            z += ft.size_
+        self._children = tuple(self._children)
+
         # use names instead of full expansion where specified
         field_reprs = [f"('{name}', {f.name_ or f.repr_})" for name, f in self.fields_]
         fields_repr = '[' + ', '.join(field_reprs) +']'
 
         self.repr_ = f"struct('{self.name_}', {fields_repr})"
 
+        # decode_ is generated as one flat expression over the leaf fields, see _decode_src
+        env = {}
+        src = 'lambda n: ' + self._fields_src(0, env)
+        self._decode = eval(compile(src, f'<{self.name_} decode_>', 'eval'), env) # pylint: disable=eval-used
+
+        # {name: (offset, mask, clear mask, encode_)} for leaf fields, see mixin_field_.v_
+        # a leaf whose v_ setter is not its encode_ (see btype._encodes_v) is assigned through it instead
+        self._encoders = {}
+        for fname, ft, z in self._children:
+            if isinstance(ft, uint) and ft._encodes_v:
+                mask = (1<<ft.size_)-1
+                self._encoders[fname] = (z, mask, ~(mask << z), ft.encode_)
+
+    def _fields_src(self, z:int, env:dict) -> str:
+        '''dict display decoding each field, the first field is most significant'''
+        items = []
+        z += self.size_
+        for fname, ft in self.fields_:
+            z -= ft.size_
+            items.append(f'{fname!r}: {ft._decode_src(z, env)}')
+        return '{' + ', '.join(items) + '}'
+
+    @property
+    def _plain_decode(self) -> bool:
+        return self._stock_decode(struct)
+
+    def _decode_src(self, z:int, env:dict) -> str:
+        if not self._plain_decode:
+            return super()._decode_src(z, env)
+        return self._fields_src(z, env)
+
+    def _decode_batch(self, x:'numpy.ndarray') -> Any:
+        if not self._plain_decode:
+            return super()._decode_batch(x)
+        return {fname: ft._decode_batch_at(x, z) for fname, ft, z in reversed(self._children)}
+
+    def _json_src(self, z:int, env:dict) -> str:
+        '''concatenation of the json text of each field, the same text as json.dumps(decode_(n))'''
+        if not self._plain_decode:
+            return super()._json_src(z, env)
+        parts = []
+        z += self.size_
+        for i, (fname, ft) in enumerate(self.fields_):
+            z -= ft.size_
+            parts.append(repr(('{' if i == 0 else ', ') + json.dumps(fname) + ': '))
+            parts.append(ft._json_src(z, env))
+        parts.append("'}'")
+        return '(' + ' + '.join(parts) + ')' if self.fields_ else "'{}'"
+
+    @property
+    def _json(self) -> Callable[[int], str]:
+        '''json text of n as one generated expression, compiled on first use, see _fuse_json'''
+        f = self.__dict__.get('_json_fn')
+        if f is None:
+            env = {}
+            src = 'lambda n: ' + self._json_src(0, env)
+            f = self._json_fn = eval(compile(src, f'<{self.name_ or self.repr_} json_>', 'eval'), env) # pylint: disable=eval-used
+        return f
+
+    def decode_(self, n:int) -> dict:
+        return self._decode(n)
+
+    def encode_(self, v:Union[int, dict]) -> int:
+        if type(v) is dict and len(v) == len(self.fields_) and self._encode:
+            try:
+                return self._encode(v)
+            except KeyError: # not the field names, assign below for the usual error
+                pass
+        if isinstance(v, int):
+            return v
+        return self(v).n_ # partial dict, unassigned fields are 0
+
+    @property
+    def _encode(self) -> Callable[[dict], int]:
+        '''encode_ of a dict of every field as one generated expression, compiled on first use
+        None unless every field is a leaf in _encoders: assigning a dict to a nested struct or array merges into it
+        '''
+        f = self.__dict__.get('_encode_fn', 0)
+        if f == 0:
+            f = None
+            if self._children and len(self._encoders) == len(self._children):
+                env = {}
+                parts = []
+                for fname, (z, mask, _, encode) in self._encoders.items():
+                    k = f'encode{len(env)}'
+                    env[k] = encode
+                    parts.append(f'(({k}(v[{fname!r}]) & {mask:#x}) << {z})')
+                f = eval(compile('lambda v: ' + ' | '.join(parts), f'<{self.name_} encode_>', 'eval'), env) # pylint: disable=eval-used
+            self._encode_fn = f
+        return f
+
+    def _walk(self, path:str, offset:int) -> Iterator[tuple]:
+        z = offset + self.size_
+        for fname, ft in self.fields_:
+            z -= ft.size_
+            p = f'{path}.{fname}' if path else fname
+            yield p, z, ft
+            yield from ft._walk(p, z)
 
     def allocate_(self, name:str='_root', parent:unbound_field=None, offset:int=0) -> unbound_field:
         '''allocate a field recursively'''
         ftype = super().allocate_(name, parent, offset)
-        z = offset
 
-        for fname, ft in reversed(self.fields_):
-            if fname.endswith('_'):
-                raise ValueError(f'Field names must not end with _: {fname}')
-
-            setattr(ftype, fname, ft.allocate_(f'{name}.{fname}', ftype, z))
-            z += ft.size_
+        for fname, ft, z in self._children:
+            setattr(ftype, fname, ft.allocate_(f'{name}.{fname}', ftype, offset + z))
+            ftype._settable.add(fname)
 
+        if type(self).mixin_field_.v_ is struct.mixin_field_.v_:
+            _fuse_v(ftype, self._decode if self._plain_decode else self.decode_)
+            _fuse_json(ftype, self)
         return ftype
 
     @property
@@ -515,17 +1484,27 @@ class struct(btype):
 
     class mixin_field_(field):
         '''inherited by bound field instance'''
+        __slots__ = ()
         @property
         def v_(self) -> dict:
-            d = {}
-            for k, _ in self.btype_.fields_:
-                d[k] = getattr(self, k).v_
-            return d
+            return self.decode_(self.n_)
 
         @v_.setter
         def v_(self, v:Union[int, dict]):
             if isinstance(v, dict):
+                # leaf fields are merged into n and written once
+                encoders = self.btype_._encoders
+                n = self.n_
+                nested = []
                 for k, fv in v.items():
+                    e = encoders.get(k)
+                    if e is None:
+                        nested.append((k, fv))
+                    else:
+                        z, mask, clear, encode = e
+                        n = n & clear | ((encode(fv) & mask) << z)
+                self.n_ = n
+                for k, fv in nested:
                     setattr(self, k, fv)
             else:
                 self.n_ = v
@@ -536,14 +1515,13 @@ class struct(btype):
 
         def __getitem__(self, k):
             if isinstance(k, str):
-                try:
-                    return getattr(self, k)
-                except AttributeError as e:
-                    if is_identifier(k):
+                if k.isidentifier(): # a field name, anything else is an expression (see expr_field_)
+                    try:
+                        return getattr(self, k)
+                    except AttributeError as e:
                         raise KeyError(f'{type(self)} does not have field "{k}"') from e
 
-                f=self.expr_field_(k)(self)
-                return f
+                return self.expr_field_(k)(self)
             else:
                 raise TypeError(f'{k.btype_.__name__} fields do not support {type(k).__name__} indices')
 
@@ -561,38 +1539,223 @@ class metastruct(struct):
 
 class array(struct):
     '''array'''
+    _decode = None
+    _typecode = None
+    _bytewise = False
+    _packed = False
 
     def __init__(self, etype: btype, dim:int, name:str=None):
         self.etype_ = etype
         self.dim_ = dim
         self.size_ = etype.size_*dim
         self.repr_ = f"{etype.name_ or etype.repr_}[{dim}]"
-        self.fields_ = tuple((f'_{i}',  etype) for i in range(dim))
         self.name_ = name
 
+        # plain integer elements of a machine size unpack in C through array.array, see decode_
+        self._typecode = _machine_typecode(etype)
+
+        # elements of 1, 2, 4 or 8 bits decode a byte at a time through a table shared by the etype, see uint._byte_lut
+        self._bytewise = _plain_int(etype) and etype.size_ in (1, 2, 4, 8) and not self._typecode
+
+        # leaf elements whose v_ setter is their encode_ (see btype._encodes_v) are packed at once by the v_ setter
+        self._packed = isinstance(etype, uint) and etype._encodes_v
+
+        # like struct, small arrays decode through one generated list display (see _decode_src)
+        self._decode = None
+        if self._plain_decode and dim <= 64 and not (self._typecode or self._bytewise):
+            env = {}
+            src = 'lambda n: ' + self._decode_src(0, env)
+            self._decode = eval(compile(src, f'<{self.repr_} decode_>', 'eval'), env) # pylint: disable=eval-used
+
+    @property
+    def fields_(self) -> tuple:
+        '''(name, etype) of each element like struct.fields_, built on first use, array methods do not need it'''
+        fields = self.__dict__.get('_fields')
+        if fields is None:
+            fields = self._fields = tuple((f'_{i}', self.etype_) for i in range(self.dim_))
+        return fields
+
+    @property
+    def _raw(self) -> 'array':
+        '''a uint array of the same layout, which decodes to the raw integers (n_) of the elements, built on first use'''
+        raw = self.__dict__.get('_raw_array')
+        if raw is None:
+            et = self.etype_
+            raw = self._raw_array = self if type(et) is uint and not et.renum_ else array(uint(et.size_), self.dim_)
+        return raw
+
+    def allocate_(self, name:str='_root', parent:unbound_field=None, offset:int=0) -> unbound_field:
+        '''allocate a field, elements are allocated on first use (see unbound_field._element)
+        since each is a class, a large array would otherwise cost one class per element up front
+        '''
+        ftype = btype.allocate_(self, name, parent, offset)
+        ftype._elements = [None] * self.dim_
+        if type(self).mixin_field_.v_.fget in (array.mixin_field_.v_.fget, utf8.mixin_field_.v_.fget):
+            _fuse_v(ftype, self._decode or self.decode_) # _decode is only generated for a plain decode_
+            _fuse_json(ftype, self)
+        return ftype
+
+    def decode_(self, n:int) -> list:
+        if self._decode:
+            return self._decode(n)
+        if self._typecode:
+            a = pyarray(self._typecode, n.to_bytes(self.size_//8, 'big'))
+            if sys.byteorder == 'little':
+                a.byteswap()
+            return a.tolist()
+        if self._bytewise:
+            v = list(chain.from_iterable(map(self.etype_._byte_lut.__getitem__, _left_bytes(n, self.size_))))
+            return v[:self.dim_] if self.size_ % 8 else v # the padding decodes to trailing elements
+        if self.dim_ >= 256 and self.size_ >= 4096:
+            return self._decode_tiled(n)
+        et = self.etype_
+        size = et.size_
+        mask = (1<<size)-1
+        decode = et._v_decode # the v_ of an element, see btype._decodes_v
+        return [decode((n >> z) & mask) for z in range(size*(self.dim_-1), -1, -size)] # element 0 is most significant
+
+    def _decode_tiled(self, n:int, tile:int=1024) -> list:
+        '''decode_ of a wide array through tiles of about tile bits, each cut from the bytes of n
+        shifting all of n once per element is quadratic in the number of elements, shifting a tile is not
+        '''
+        et, dim = self.etype_, self.dim_
+        size = et.size_
+        mask = (1<<size)-1
+        decode = et._v_decode
+        from_bytes = int.from_bytes
+        b = memoryview(_left_bytes(n, self.size_))
+        k = max(1, tile // size) # elements per tile
+        v = []
+        for i in range(0, dim, k):
+            j = min(i+k, dim)
+            end = (j*size+7)//8
+            t = from_bytes(b[i*size//8:end], 'big') >> (end*8 - j*size) # elements i..j-1, j-1 least significant
+            v += [decode((t >> z) & mask) for z in range(size*(j-i-1), -1, -size)]
+        return v
+
+    def encode_(self, v:Union[int, list, tuple]) -> int:
+        if isinstance(v, int):
+            return v
+        return self(v).n_ # the v_ setter packs the elements, unassigned trailing elements are 0
+
+    @property
+    def _plain_decode(self) -> bool:
+        return self._stock_decode(array)
+
+    def _decode_src(self, z:int, env:dict) -> str:
+        if not self._plain_decode or self.dim_ > 64: # keep generated source small
+            return btype._decode_src(self, z, env) # not struct's, which would decode fields_ into a dict
+        et = self.etype_
+        return '[' + ', '.join(et._decode_src(zz, env) for zz in range(z+et.size_*(self.dim_-1), z-1, -et.size_)) + ']'
+
+    def _decode_batch(self, x:'numpy.ndarray') -> Any:
+        if not self._plain_decode:
+            return super()._decode_batch(x)
+        et = self.etype_
+        columns = [et._decode_batch_at(x, z) for z in range(et.size_*(self.dim_-1), -1, -et.size_)]
+        if columns and isinstance(columns[0], numpy.ndarray):
+            return numpy.stack(columns, axis=1)
+        return columns # e.g. a list with {name: column} of each struct element
+
+    def _split_batch(self, n:int) -> 'numpy.ndarray':
+        '''the raw elements of n as a numpy array, element 0 first, uint64 if they fit, see mixin_field_.vn_'''
+        et, dim = self.etype_, self.dim_
+        size = et.size_
+        if size > 64:
+            mask = (1<<size)-1
+            return numpy.array([(n >> z) & mask for z in range(size*(dim-1), -1, -size)], dtype=object)
+        w = next(w for w in (8, 16, 32, 64) if size <= w) # the machine word an element is widened to
+        b = numpy.frombuffer(_left_bytes(n, self.size_), dtype=numpy.uint8)
+        if size != w:
+            bits = numpy.zeros((dim, w), dtype=numpy.uint8)
+            bits[:, w-size:] = numpy.unpackbits(b)[:self.size_].reshape(dim, size)
+            b = numpy.packbits(bits, axis=1)
+        return b.view(f'>u{w//8}').ravel().astype(numpy.uint64)
+
+    def _json_src(self, z:int, env:dict) -> str:
+        if not self._plain_decode or self.dim_ > 64:
+            return btype._json_src(self, z, env) # likewise not struct's
+        if not self.dim_:
+            return "'[]'"
+        et = self.etype_
+        items = (et._json_src(zz, env) for zz in range(z+et.size_*(self.dim_-1), z-1, -et.size_))
+        return "('[' + " + " + ', ' + ".join(items) + " + ']')"
+
+    def _walk(self, path:str, offset:int) -> Iterator[tuple]:
+        et = self.etype_
+        z = offset + self.size_
+        for i in range(self.dim_):
+            z -= et.size_
+            p = f'{path}[{i}]'
+            yield p, z, et
+            yield from et._walk(p, z)
+
     class mixin_field_(struct.mixin_field_):
         '''inherited by bound field instance'''
+        __slots__ = ()
         @property
         def v_(self) -> list:
-            return [self[i].v_ for i in range(self.btype_.dim_)]
+            return self.decode_(self.n_)
 
         @v_.setter
         def v_(self, v:Union[int, list, tuple]):
             if isinstance(v, int):
                 self.n_ = v
             elif isiter(v):
-                for i, fv in enumerate(v):
-                    setattr(self, f'_{i}', fv)
+                bt = self.btype_
+                et = bt.etype_
+                if bt._packed and bt._typecode and isinstance(v, (list, tuple)) and len(v) == bt.dim_:
+                    # whole array of machine size integers, pack in C through array.array
+                    try:
+                        a = pyarray(bt._typecode, v)
+                    except (TypeError, OverflowError):
+                        pass # e.g. str or out of range values, encode_ each element below
+                    else:
+                        if sys.byteorder == 'little':
+                            a.byteswap()
+                        self.n_ = int.from_bytes(a.tobytes(), 'big')
+                        return
+                if bt._packed:
+                    # pack leaf elements into one integer and write it once, element 0 is most significant
+                    size = et.size_
+                    mask = (1<<size)-1
+                    encode = et.encode_
+                    packed = 0
+                    k = 0
+                    for fv in v:
+                        packed = (packed << size) | (encode(fv) & mask)
+                        k += 1
+                    if k > bt.dim_:
+                        raise IndexError(f'{type(self).desc_}: {k} values assigned to array of {bt.dim_}')
+                    z = size*(bt.dim_-k) # unassigned trailing elements keep their value
+                    self.n_ = (self.n_ & ((1<<z)-1)) | (packed << z)
+                else:
+                    type(self)._set_elements(self, v)
             else:
                 raise TypeError('assignment to array must be int or iterable')
 
+        @property
+        def ns_(self) -> list:
+            '''the raw integers (n_) of the elements, decoded at once like v_, without binding a field per element'''
+            return self.btype_._raw.decode_(self.n_)
+
+        @property
+        def vn_(self) -> Any:
+            '''the elements decoded into a numpy array at once, a struct element type decodes to {name: column}
+            the bits are split with numpy instead of shifting n_ once per element, see btype.decode_batch_
+            requires numpy: pip install numpy
+            '''
+            if numpy is None:
+                raise ImportError('vn_ requires numpy: pip install numpy')
+            bt = self.btype_
+            return bt.etype_._decode_batch(bt._split_batch(self.n_))
+
         def __getitem__(self, k):
             if isinstance(k, int):
-                try:
-                    k = f'_{k}' # array elements as field property instances
-                    return getattr(self, k)
-                except AttributeError as e:
-                    raise IndexError(f'array index {k[1:]} out of range') from e
+                elements = type(self)._elements # array elements as field property instances
+                if 0 <= k < len(elements):
+                    return (elements[k] or type(self)._element(k))(self)
+                raise IndexError(f'array index {k} out of range')
             elif(isinstance(k, slice)):
                 ftype = type(self)[k]
                 return ftype(self)
@@ -600,8 +1763,40 @@ class array(struct):
                 return super().__getitem__(k)
 
         def __iter__(self):
-            for f in iter(type(self)):
-                yield f(self)
+            # like unbound_field.__get__, iterating again through the same field hands out the same bindings
+            cls = type(self)
+            for i, f in enumerate(cls._elements):
+                yield _bound(self, f or cls._element(i))
+
+        def at_(self, i:int) -> Any:
+            '''return the value of element i without binding an element field, same as self[i].v_'''
+            et, dim = self.etype_, self.dim_
+            if not 0 <= i < dim:
+                raise IndexError(f'array index {i} out of range')
+            return et._v_decode((self.target_[0] >> (self.offset_ + et.size_*(dim-1-i))) & ((1<<et.size_)-1))
+
+        def set_at_(self, i:int, v:Any):
+            '''set the value of element i without binding an element field, same as self[i].v_ = v'''
+            et, dim = self.etype_, self.dim_
+            if not 0 <= i < dim:
+                raise IndexError(f'array index {i} out of range')
+            z = self.offset_ + et.size_*(dim-1-i)
+            mask = (1<<et.size_)-1
+            t = self.target_
+            n = t[0]
+            t[0] = n & ~(mask << z) | ((et._v_assign((n >> z) & mask, v) & mask) << z)
+
+        def swap_(self, i:int, j:int):
+            '''exchange elements i and j in place, with one xor of their differing bits into the target'''
+            size, dim = self.etype_.size_, self.dim_
+            if not (0 <= i < dim and 0 <= j < dim):
+                raise IndexError(f'array index {i if not 0 <= i < dim else j} out of range')
+            zi = self.offset_ + size*(dim-1-i)
+            zj = self.offset_ + size*(dim-1-j)
+            t = self.target_
+            n = t[0]
+            d = ((n >> zi) ^ (n >> zj)) & ((1<<size)-1)
+            t[0] = n ^ (d << zi) ^ (d << zj) # no-op when i == j, d is then 0
 
 
 class bslice(array):
@@ -621,31 +1816,67 @@ class bslice(array):
         '''allocate a field recursively'''
         ftype = btype.allocate_(self, name, parent, offset)
 
-        for i,j in enumerate(self.islice_):
-            setattr(ftype, f'_{i}', parent[j])
+        ftype._elements = tuple(parent[j] for j in self.islice_)
+        for i, f in enumerate(ftype._elements):
+            setattr(ftype, f'_{i}', f)
 
         return ftype
 
+    def _walk(self, path:str, offset:int) -> Iterator[tuple]:
+        raise TypeError(f'{self} elements are not packed, it has no flat layout')
+
+    class mixin_field_(array.mixin_field_):
+        '''inherited by bound field instance'''
+        __slots__ = ()
+        @property
+        def v_(self) -> list:
+            # slice elements are bound to the sliced array, not packed in this field's n_
+            return [self[i].v_ for i in range(self.dim_)]
+
+        @property
+        def ns_(self) -> list:
+            return [self[i].n_ for i in range(self.dim_)]
+
+        def at_(self, i:int) -> Any:
+            return self[i].v_
+
+        def set_at_(self, i:int, v:Any):
+            self[i].v_ = v
+
+        def swap_(self, i:int, j:int):
+            a, b = self[i], self[j]
+            a.n_, b.n_ = b.n_, a.n_
+
+        @v_.setter
+        def v_(self, v:Union[int, list, tuple]):
+            if isinstance(v, int):
+                self.n_ = v
+            elif isiter(v):
+                type(self)._set_elements(self, v)
+            else:
+                raise TypeError('assignment to array must be int or iterable')
+
 
 class utf8(array):
     '''unicode utf8 string, optionally null terminated'''
-    # TODO: Low hanging performance fruit, if anyone needs this to be fast
 
     def __init__(self, length:int, nult:bool=True, name_:str = None):
         super().__init__(uint(8), length)
         self.repr_ = f"utf8({length})"
         self.nult_ = nult
 
+    def decode_(self, n:int) -> str:
+        b = n.to_bytes(self.dim_, 'big') # element 0 is most significant
+        if self.nult_:
+            b = b.partition(b'\0')[0]
+        return b.decode('utf8')
+
     class mixin_field_(array.mixin_field_):
         '''inherited by bound field instance'''
+        __slots__ = ()
         @property
         def v_(self) -> str:
-            b = bytes(self[i] for i in range(self.dim_))
-            if self.nult_:
-                n = b.find(0)
-                if n>-1:
-                    b = b[:n]
-            return b.decode('utf8')
+            return self.decode_(self.n_) # all bytes at once, see utf8.decode_
 
         @v_.setter
         def v_(self, v:str):
@@ -659,10 +1890,8 @@ class utf8(array):
                 else:
                     raise TypeError(f'Expected str|bytes|int, got {v}')
 
-                s = (s + b'\0'*self.dim_)[:self.dim_] # null pad to length
-
-                for i, c in enumerate(s):
-                    self[i] = c
+                s = s[:self.dim_].ljust(self.dim_, b'\0') # null pad to length
+                self.n_ = int.from_bytes(s, 'big') # element 0 is most significant
 
 
 class fn_type(btype):
@@ -672,8 +1901,8 @@ class fn_type(btype):
         self.repr_ = f"fn_type({fn})"
         self.name_ = type(self).__name__
 
-
     class mixin_field_(field):
+        __slots__ = ()
         @property
         def v_(self) -> Any:
             return self.fn_(self.target_[0])
@@ -682,6 +1911,14 @@ class fn_type(btype):
         def n_(self) -> int:
             return int(self.v_)
 
+        def __int__(self):
+            return self.n_
+
+        __index__ = __int__
+
+        def __bool__(self):
+            return self.n_ != 0
+
 
 class BTypesTest(unittest.TestCase):
     'btypes test suite'
@@ -692,6 +1929,16 @@ class BTypesTest(unittest.TestCase):
 
         self.assertEqual(repr(u4t), 'uint(4)')
         self.assertEqual(repr(u4), '<3>')
+        self.assertIs(uint(4), u4t) # interned
+        self.assertIsNot(sint(4), u4t)
+        e = {'a': 1}
+        self.assertIs(uint(2, e), uint(2, {'a': 1}))
+        self.assertIsNot(uint(2, e), uint(2, {'a': 1}, name='x'))
+        e['b'] = 2 # enum_ is a copy
+        self.assertEqual(uint(2, {'a': 1}).enum_, {'a': 1})
+        with self.assertRaises(AttributeError): # shared, so immutable
+            u4t.enum_ = {'x': 1}
+        self.assertEqual(uint(4).enum_, {})
         self.assertEqual(u4.n_, 3)
         self.assertEqual(u4, 3)
         u4 += 2
@@ -704,6 +1951,65 @@ class BTypesTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             u4 /= 2
 
+    def test_wide(self):
+        # the target is an unbounded int, fields may be wider than and straddle machine words
+        wide = struct('wide', [('a', uint(100)), ('b', sint(70)), ('c', uint(3)[50])])
+        w = wide({'a': (1<<100)-1, 'b': -(1<<69), 'c': [5]*50})
+        self.assertEqual(w.a, (1<<100)-1)
+        self.assertEqual(w.b, -(1<<69))
+        self.assertEqual(w.c[49], 5)
+        w.b = 1
+        self.assertEqual(w.v_['a'], (1<<100)-1)
+        self.assertEqual(w.v_['b'], 1)
+
+        x = sint(6)[1000](list(range(-32, 32))*15) # wider than 2048 bits: writes xor the changed bits
+        for i in (0, 499, 500, 999):
+            x[i] = -5
+            self.assertEqual(x[i], -5)
+        self.assertEqual(x.v_[:4], [-5, -31, -30, -29])
+        self.assertEqual(x.v_[498:502], [18, -5, -5, 21])
+
+    @unittest.skipIf(numpy is None, 'requires numpy')
+    def test_decode_batch(self):
+        abc = struct('abc', [('a', uint(3, enum_={'x': 1})), ('b', sint(64)), ('c', decimal(9, 1)[3]), ('d', utf8(2))])
+        values = [abc({'a': randint(0, 7), 'b': randint(-1<<63, (1<<63)-1), 'c': [randint(-255, 255)/10 for _ in range(3)], 'd': 'ok'}).n_
+                  for _ in range(20)]
+        batch = abc.decode_batch_(values)
+        self.assertEqual(batch['b'].dtype, numpy.int64)
+        self.assertEqual(batch['c'].shape, (20, 3))
+        for i, n in enumerate(values):
+            v = abc(n).v_
+            self.assertEqual([batch['a'][i], batch['b'][i], batch['c'][i].tolist(), batch['d'][i]], list(v.values()))
+        view = struct('outer', [('x', uint(1)), ('inner', abc)]).view_soa_(values)
+        self.assertIs(view.inner.b, view.inner.b) # decoded once
+        self.assertEqual(view.inner.b.tolist(), batch['b'].tolist())
+        self.assertEqual(view['inner.c[2]'].tolist(), batch['c'][:, 2].tolist())
+        for et in (uint(6), sint(12), decimal(9, 1), uint(64)):
+            a = et[37]()
+            a.n_ = randint(0, (1<<a.size_)-1)
+            self.assertEqual(a.vn_.tolist(), a.v_)
+
+    def test_bulk_array(self):
+        # large arrays decode a byte or a machine word at a time, values must match per element access
+        for et in (uint(1), uint(2), sint(4), uint(8, enum_={'a': 0, 'b': 1}), uint(16), sint(32)):
+            a = et[99]()
+            a.n_ = randint(0, (1<<a.size_)-1)
+            self.assertEqual(a.v_, [a[i].v_ for i in range(99)])
+            self.assertEqual(a, [int(a[i]) for i in range(99)])
+            self.assertEqual(a, [str(a[i]) for i in range(99)])
+        for et in (uint(6), sint(13), uint(700)): # wide arrays decode through tiles, see array._decode_tiled
+            a = et[300]()
+            a.n_ = randint(0, (1<<a.size_)-1)
+            self.assertEqual(a.v_, [a[i].v_ for i in range(300)])
+        b = sint(16)[100]()
+        b.v_ = list(range(-50, 50))
+        self.assertEqual(b.v_, list(range(-50, 50)))
+        b.v_ = [1<<20]*100 # out of range for array.array, masked like smaller assignments
+        self.assertEqual(b[0], 0)
+        c = struct('c', [('e', uint(2, enum_={'a': 0, 'b': 1})), ('x', sint(3))])[3]([1, 2, 3])
+        self.assertEqual(c, [{'e': 'a', 'x': 1}, {'e': 'a', 'x': 2}, {'e': 'a', 'x': 3}])
+        self.assertNotEqual(c, [{'e': 'b', 'x': 1}, {'e': 'a', 'x': 2}, {'e': 'a', 'x': 3}])
+
 
     def test_hex_bin(self):
         x = uint(35)()
@@ -743,14 +2049,60 @@ class BTypesTest(unittest.TestCase):
 
         self.assertEqual(f.b, -1)
 
+        f.bars[2].f[3].a = 5
+        self.assertEqual(f.read_('bars[2].f[3].a'), 5)
+        f.write_('bars[4].c', 17)
+        self.assertEqual(f.bars[4].c, 17)
+        f.write_('bars[1]', {'f': [{'a': 1, 'b': 2}], 'c': 3}) # merged like f.bars[1].v_ = ...
+        self.assertEqual((f.bars[1].f[0].b, f.bars[1].f[1].a, f.bars[1].c), (2, 0, 3))
+        f.write_('bars[1]', {'c': 4}) # a partial dict leaves the other members
+        self.assertEqual((f.bars[1].f[0].b, f.bars[1].c), (2, 4))
+        f.write_('bars[1].f', [{'a': 6}])
+        self.assertEqual((f.bars[1].f[0].a, f.bars[1].f[0].b), (6, 2))
+        self.assertEqual(eric.encode_({'a': 1, 'b': 2}), 0x12)
+        self.assertEqual(f.read_('a'), 'beta')
+        self.assertEqual(f.bars[2].read_('f[3].a'), 5)
+
+        f.v_ = {'a': 'gamma', 'b': -3, 'bars': [{'c': 9}]}
+        self.assertEqual((f.a, f.b, f.bars[0].c, f.bars[2].f[3].a), ('gamma', -3, 9, 5))
+        self.assertEqual(f.v_['bars'][4]['c'], 17)
+
+        for bf in (f, f.a, f.b, f.bars, f.bars[2], f.bars[2].f[3].a):
+            self.assertEqual(type(bf).__dictoffset__, 0, f'{type(bf)} instances have a __dict__')
+
+        btypes = [btype]
+        for bt in btypes: # every btype mixin, including ones not exercised above
+            btypes.extend(type.__subclasses__(bt))
+            self.assertEqual(getattr(bt, 'mixin_field_', field).__dictoffset__, 0, f'{bt.__name__}.mixin_field_ instances have a __dict__')
+
+        # subfield bindings are kept by the field they are read through
+        self.assertIs(f.bars, f.bars)
+        self.assertIs(list(f.bars)[2], list(f.bars)[2])
+        g = foobar(0)
+        self.assertIsNot(g.bars, f.bars)
+        g.bars[4].c = 1
+        self.assertEqual((f.bars[4].c, g.bars[4].c), (17, 1))
+        self.assertEqual([e.c.v_ for e in g.bars], [0, 0, 0, 0, 1])
+
         with self.assertRaises(KeyError):
             f['c']
 
         with self.assertRaises(AttributeError):
             f.c
 
+        with self.assertRaises(AttributeError):
+            f.c = 1
+
+        for k in ('note', '_note', 'note_'): # no __dict__ to attach user attributes to
+            with self.assertRaises(AttributeError):
+                setattr(f.b, k, 1)
+
+        with self.assertRaisesRegex(AttributeError, 'did you mean v_ ?'):
+            f.v = 1
+
         self.assertEqual(repr(idle), "struct('idle', [('f', eric[10]), ('c', uint(5))])")
         self.assertEqual(repr(eric), "struct('eric', [('a', uint(3)), ('b', uint(4))])")
+        self.assertEqual(eric({'a': 3, 'b': 1}), {'a': 3, 'b': 1})
 
     def test_class(self):
         class eric(metaclass=metastruct):
@@ -764,12 +2116,33 @@ class BTypesTest(unittest.TestCase):
 
 ''')
 
+    def test_hash(self):
+        # equal objects hash equal: fields of a plain number hash like it, other fields are unhashable
+        s = sint(4)(-1)
+        self.assertEqual(hash(s), hash(-1))
+        self.assertIn(-1, {s})
+        self.assertNotEqual(s, uint(4)(15)) # same n_, different values
+        self.assertEqual(uint(4)(3), uint(8)(3))
+        self.assertEqual(hash(uint(4)(3)), hash(uint(8)(3)))
+        self.assertNotEqual(decimal(12, 1)(1.5), 1)
+        dead = uint(2, {'dead': 0})()
+        self.assertEqual(dead, 'dead')
+        for f in (dead, utf8(2)('ab'), struct('xy', [('x', uint(2)), ('y', uint(2))])({'x': 1}), uint(2)[2]([1, 2])):
+            with self.assertRaises(TypeError):
+                hash(f)
+
     def test_decimal(self):
         money = decimal(16, 2)(123.45)
 
         self.assertEqual(money, 123.45)
         self.assertEqual(money.n_, 12345)
         self.assertEqual(money+1.0, 124.45)
+        with self.assertRaisesRegex(ValueError, 'out of range'): # one check in decimal.encode_ for v_ and struct members
+            money.v_ = 1000.0
+        with self.assertRaisesRegex(ValueError, 'out of range'):
+            struct('m', [('money', decimal(16, 2))])({'money': 1000.0})
+        self.assertIn(1.5, {decimal(12, 1)(1.5)}) # hashes like float
+        self.assertIn(2, {decimal(12, 1)(2.0)})
 
     def test_expr(self):
         class seven_type(metaclass=metastruct):
@@ -780,6 +2153,8 @@ class BTypesTest(unittest.TestCase):
 
         self.assertEqual(seven.a.expr_(), '(n >> 4 & 0x7)')
         self.assertEqual(seven.b.expr_(), '(n & 0xf)')
+        self.assertEqual(seven.a.expr_('', 4), '(n[1] & 0x7)') # word 1 holds bits 4..7
+        self.assertEqual(seven.a.expr_('', 6), '((n[0] >> 4 | n[1] << 2) & 0x7)')
 
         ab = seven['a * b']
 
@@ -792,10 +2167,87 @@ class BTypesTest(unittest.TestCase):
         self.assertEqual(ab.expr_(), '(n >> 4 & 0x7) * (n & 0xf)')
         self.assertEqual(ab.expr_(), '(n >> 4 & 0x7) * (n & 0xf)')
 
+        self.assertEqual(seven.b.vmap_(0x5b), 11)
+        self.assertEqual(seven.vmap_(0x5b, 'a * b'), 55)
+        self.assertEqual(seven.vmap_([0x5b, 0x12], 'a * b'), [55, 2])
+        self.assertEqual(seven.filter_([0x5b, 0x12, 0x51], 'a == 5 and b > 1'), [0x5b])
+
+    def test_cst(self):
+        try:
+            import libcst # pylint: disable=import-outside-toplevel,unused-import
+        except ImportError:
+            self.skipTest('requires libcst')
+        from btypes.expressions import cst_source_code # pylint: disable=import-outside-toplevel
+        seven = struct('seven', [('a', uint(3)), ('b', uint(4))])()
+        for ws in (0, 4, 6): # in one word, and spanning two
+            self.assertEqual(cst_source_code(seven.a.cst_('', ws)), seven.a.expr_('', ws))
+
+    def test_array(self):
+        a = sint(5)[4]([3, -1, -16, 15])
+        self.assertEqual(a.v_, [3, -1, -16, 15])
+        self.assertEqual(a[1], -1)
+
+        a.v_ = [7, -7] # partial assignment leaves the remaining elements
+        self.assertEqual(a.v_, [7, -7, -16, 15])
+        self.assertEqual(a, [7, -7, -16, 15])
+        self.assertEqual(a._2, -16) # pylint: disable=protected-access
+        self.assertEqual(a.ns_, [a[i].n_ for i in range(4)])
+        self.assertEqual(a[1:3].ns_, a.ns_[1:3])
+        s = sint(5)[4](a.v_)
+        s.swap_(0, 3)
+        self.assertEqual(s, [15, -7, -16, 7])
+        s.swap_(2, 2)
+        s[1:4].swap_(0, 2)
+        self.assertEqual(s, [15, 7, -16, -7])
+        self.assertEqual(a.at_(1), -7)
+        a.set_at_(2, -15)
+        self.assertEqual(a[2], -15)
+        a[1:3].set_at_(1, -16)
+        self.assertEqual(a[1:3].at_(1), -16)
+        a._3 = 14 # pylint: disable=protected-access
+        a[3] += 1
+        self.assertNotEqual(a, (7, -7, -16, 14))
+        self.assertNotEqual(a, [7, -7, -16])
+        self.assertEqual(a, ['7', '-7', '-16', '15'])
+        with self.assertRaises(IndexError):
+            a[4] # pylint: disable=pointless-statement
+
+        w = uint(8)[100](range(100)) # wide root: low half elements mask before shifting
+        self.assertEqual([int(e) for e in w], list(range(100)))
+        w[97] = 3
+        self.assertEqual((w[96].n_, w[97].n_, w[98].n_), (96, 3, 98))
+        self.assertIs(type(a)[1:3], type(a)[1:3])
+        self.assertIs(a.btype_.etype_[4], a.btype_)
+        self.assertEqual({a[1]: 'x', 3: 'y'}, {-7: 'x', 3: 'y'}) # hashes like int
+        self.assertIn(7, {a[0]})
+        b = a.btype_(a.v_)
+        self.assertIs(type(b), type(a))
+        b[0] = 1
+        self.assertEqual(a[0], 7)
+
+        self.assertEqual(a.bytes_, a.n_.to_bytes(3, 'big'))
+        b.bytes_ = a.bytes_
+        self.assertEqual(b, a)
+        self.assertEqual(a.btype_.unpack_(a.bytes_ * 2), [a, a])
+        self.assertEqual(a.btype_.pack_([a, a.v_]), a.bytes_ * 2)
+        self.assertEqual(a.btype_.unpack_values_(a.bytes_ * 2), [a.v_, a.v_])
+        self.assertEqual(sint(16).unpack_values_(b'\xff\xfe\x00\x07'), [-2, 7])
+        self.assertEqual(a.btype_.from_buffer_(bytearray(b'\0' + bytes(a)), 1), a)
+        self.assertEqual(a[1:3], [-7, -16])
+
+        with self.assertRaises(IndexError):
+            a.v_ = range(5)
+
+        d = decimal(12, 1)[3]([1.5, -2.0, 0.0])
+        self.assertEqual(d.v_, [1.5, -2.0, 0.0])
+
     def test_unicode(self):
         s = utf8(10)()
         s.v_ = 'abc'
         self.assertEqual(s.v_, 'abc')
+        self.assertEqual((s[0], s[3]), (ord('a'), 0)) # element 0 is the first byte
+        s.v_ = b'0123456789ab' # truncated to length
+        self.assertEqual(s.v_, '0123456789')
 
     def test_svreg(self):
         r = svreg(28)(0xabadbee)
@@ -805,6 +2257,41 @@ class BTypesTest(unittest.TestCase):
         r[3:0] = 0xd
         self.assertEqual(r, 0xdeadbee)
 
+    def test_custom_mixin(self):
+        class upper(uint): # overloads v_ only, the generated decoders must read it rather than uint.decode_
+            class mixin_field_(uint.mixin_field_):
+                __slots__ = ()
+                @property
+                def v_(self) -> str:
+                    return f'U{int(self)}'
+
+                @v_.setter
+                def v_(self, v):
+                    self.n_ = int(v[1:]) if isinstance(v, str) else v
+
+        s = struct('s', [('a', upper(4)), ('b', uint(4))])({'a': 3, 'b': 2})
+        self.assertEqual(s.v_, {'a': 'U3', 'b': 2})
+        self.assertEqual(s.json_, '{"a": "U3", "b": 2}')
+        self.assertEqual(s.read_('a'), 'U3')
+        s.v_ = {'a': 'U5', 'b': 1} # assigned through the v_ setter, not merged with uint.encode_
+        self.assertEqual((s.a.n_, s.b), (5, 1))
+        s.write_('a', 'U7')
+        self.assertEqual(s.v_, {'a': 'U7', 'b': 1})
+        self.assertEqual(s.btype_.encode_({'a': 'U1', 'b': 2}), 0x12)
+        for dim in (3, 100, 1100): # generated, per element and tiled decode_
+            a = upper(4)[dim]()
+            a.n_ = randint(0, (1<<a.size_)-1)
+            self.assertEqual(a.v_, [a[i].v_ for i in range(dim)])
+            self.assertEqual(a, a.v_)
+            self.assertEqual(a.at_(2), a[2].v_)
+        self.assertEqual(upper(8)[2].unpack_values_(b'\1\2'), [['U1', 'U2']])
+        a = upper(4)[3](['U1', 'U2', 'U3'])
+        self.assertEqual(a.v_, ['U1', 'U2', 'U3'])
+        a.set_at_(0, 'U9')
+        self.assertEqual(a[0].n_, 9)
+        b = upper(8)[4](['U1', 'U2', 'U3', 'U4']) # a machine size uint would pack through array.array
+        self.assertEqual(b.n_, 0x01020304)
+
     def test_readme_parrot(self):
         class parrot_struct(metaclass=metastruct):
             status: uint(2, {'dead': 0, 'pining': 1, 'resting': 2})
@@ -901,6 +2388,13 @@ class BTypesTest(unittest.TestCase):
             jstrs.append(jstr)
 
         self.assertEqual(len(jstrs), 4)
+        dead = quest_struct.where_(sequence_of_integers_from_somewhere(), 'parrot.status', 'dead')
+        self.assertEqual([quest_struct(n).json_ for n in dead], jstrs)
+        self.assertEqual([json.dumps(quest_struct(n).v_) for n in dead], jstrs) # generated json_ matches json.dumps
+        columns = quest_struct.columns_(dead)
+        self.assertEqual(columns['knights[1].cause_of_death'][0], 'vorpal_bunny')
+        self.assertEqual(columns['knights[0].name'][0], 'Sir Gareth')
+        self.assertNotIn('knights[0].name[0]', columns)
         self.assertEqual(jstrs[0], '{"quest": "meaning", "knights": [{"name": "Sir Gareth", "cause_of_death": "mint"}, {"name": "Sir Bleoberis", "cause_of_death": "vorpal_bunny"}, {"name": "Sir Degore", "cause_of_death": "question"}], "holy": 0, "parrot": {"status": "dead", "plumage_rgb": [6, 25, 27]}}')
 
 __all__ = list(set([x for x in locals().keys() if not x.startswith('_')]) - _all_above_excluded)
@@ -23,10 +23,9 @@ an array of unsigned integers of the specified size.
 The expression may evaluate to either signed or unsigned integers. It is up
 to the client to choose appropriate type to consume the result.
 
-Although btypes has no third party requirements, the features supported by
-this submodule require libcst: pip install libcst
-
-libcst: pip install libcst
+Although btypes has no third party requirements, the cst_* functions of
+this submodule require libcst: pip install libcst (or pip install btypes[cst])
+libcst is imported on first use, the src_* functions do not need it.
 
 Copyright 2020, Ken Seehart
 MIT License
@@ -34,29 +33,35 @@ https://github.com/kenseehart/btypes
 '''
 
 from typing import Callable
+from functools import lru_cache
+import io
+import keyword
+import tokenize
 
-from libcst import CSTNode, Integer, Subscript, BinaryOperation, RightShift, CSTTransformer, parse_expression, Name, BitAnd, Integer, LeftParen, RightParen, Module
+# libcst takes longer to import than the rest of btypes, so cst_* functions import it when called
 
-def cst_ni(i: int) -> CSTNode:
+def cst_ni(i: int) -> 'CSTNode':
     '''
     n[{i}]
     '''
-    return Subscript(
-        value=Name(value='n'),
+    import libcst
+    return libcst.Subscript(
+        value=libcst.Name(value='n'),
         slice=[
-            SubscriptElement(slice=Index(value=Integer(value='0'))),
+            libcst.SubscriptElement(slice=libcst.Index(value=libcst.Integer(value=str(i)))),
         ])
 
-def cst_shift_and(node: CSTNode, offset: int, mask: int=-1) -> CSTNode:
+def cst_shift_and(node: 'CSTNode', offset: int, mask: int=-1) -> 'CSTNode':
     '''
     ({node} >> 7 & 0x1f)
     '''
+    import libcst
 
     if offset:
-        lnode = BinaryOperation(
+        lnode = libcst.BinaryOperation(
             left=node,
-            operator=RightShift(),
-            right=Integer(value=str(offset)),
+            operator=libcst.RightShift(),
+            right=libcst.Integer(value=str(offset)),
         )
     else:
         lnode = node
@@ -64,35 +69,47 @@ def cst_shift_and(node: CSTNode, offset: int, mask: int=-1) -> CSTNode:
     if mask==-1:
         return lnode
     else:
-        return BinaryOperation(
+        return libcst.BinaryOperation(
             left=lnode,
-            operator=BitAnd(),
-            right=Integer(hex(mask)),
-            lpar=[LeftParen()],
-            rpar=[RightParen()],
+            operator=libcst.BitAnd(),
+            right=libcst.Integer(hex(mask)),
+            lpar=[libcst.LeftParen()],
+            rpar=[libcst.RightParen()],
         )
 
-def cst_or(n0: CSTNode, n1: CSTNode) -> CSTNode:
+def cst_shift_left(node: 'CSTNode', offset: int) -> 'CSTNode':
+    '''
+    {node} << 7
+    '''
+    import libcst
+    return libcst.BinaryOperation(
+        left=node,
+        operator=libcst.LeftShift(),
+        right=libcst.Integer(value=str(offset)),
+    )
+
+def cst_or(n0: 'CSTNode', n1: 'CSTNode') -> 'CSTNode':
     '''
     ({n0} | {n1})
     '''
-    return BinaryOperation(
+    import libcst
+    return libcst.BinaryOperation(
         left=n0,
-        operator=BitOr(),
+        operator=libcst.BitOr(),
         right=n1,
-        lpar=[LeftParen()],
-        rpar=[RightParen()],
+        lpar=[libcst.LeftParen()],
+        rpar=[libcst.RightParen()],
     )
 
 
-def cst_uint(offset: int, mask: int, word_size: int=0) -> CSTNode:
+def cst_uint(offset: int, mask: int, word_size: int=0) -> 'CSTNode':
     '''return a cst node for a uint field
 
     :param offset: bit offset
     :param mask: bit mask
     :param word_size: native word size in bits (default 0 = unlimited, suitable for native python)
 
-    example: ((n[5]>>7)&0x3f)
+    example: (n[5] >> 7 & 0x3f), the same code as src_uint(offset, mask, word_size)
     '''
 
     if word_size:
@@ -103,29 +120,30 @@ def cst_uint(offset: int, mask: int, word_size: int=0) -> CSTNode:
         k = offset % word_size
         m1 = mask >> word_size*(j+1)-offset
 
-        if m1: # span two words
+        if m1: # span two words, word j holds the low bits
             n0 = cst_shift_and(cst_ni(j), k)
-            n1 = cst_shift_and(cst_ni(j), 0, mask)
-            return cst_or(n0, n1)
+            n1 = cst_shift_left(cst_ni(j+1), word_size-k)
+            return cst_shift_and(cst_or(n0, n1), 0, mask)
 
-        return cst_shift_and(cst_ni(j), offset, mask)
+        return cst_shift_and(cst_ni(j), k, mask)
     else:
-        return cst_shift_and(Name(value='n'), offset, mask)
+        import libcst
+        return cst_shift_and(libcst.Name(value='n'), offset, mask)
 
 
-class NameTransformer(CSTTransformer):
-    def __init__(self, resolver:Callable[[str], CSTNode]):
-        self.resolver = resolver
+@lru_cache(maxsize=None)
+def name_transformer() -> type:
+    '''return the NameTransformer class, defined on first use since it subclasses libcst.CSTTransformer'''
+    import libcst
 
-    def leave_Name(self, original_node: Name, updated_node: Name) -> CSTNode:
-        return self.resolver(original_node.value)
+    class NameTransformer(libcst.CSTTransformer):
+        def __init__(self, resolver:Callable[[str], 'CSTNode']):
+            self.resolver = resolver
 
-class NameTransformer(CSTTransformer):
-    def __init__(self, resolver:Callable[[str], CSTNode]):
-        self.resolver = resolver
+        def leave_Name(self, original_node: libcst.Name, updated_node: libcst.Name) -> 'CSTNode':
+            return self.resolver(original_node.value)
 
-    def leave_Name(self, original_node: Name, updated_node: Name) -> CSTNode:
-        return self.resolver(original_node.value)
+    return NameTransformer
 
 
 #visitor = TypingCollector()
@@ -133,7 +151,7 @@ class NameTransformer(CSTTransformer):
 #transformer = TypingTransformer(visitor.annotations)
 #modified_tree = source_tree.visit(transformer)
 
-def cst_expr(expr: str, resolver: Callable[[str], CSTNode], word_size: int=0) -> CSTNode:
+def cst_expr(expr: str, resolver: Callable[[str], 'CSTNode'], word_size: int=0) -> 'CSTNode':
     '''return a cst node for a expression
 
     :param str: expression in field namespace to be translated
@@ -142,19 +160,85 @@ def cst_expr(expr: str, resolver: Callable[[str], CSTNode], word_size: int=0) ->
 
     '''
 
-    cst = parse_expression(expr)
-    visitor = NameTransformer(resolver)
+    import libcst
+    cst = libcst.parse_expression(expr)
+    visitor = name_transformer()(resolver)
     new_cst = cst.visit(visitor)
     return new_cst
 
+def src_shift_and(src: str, offset: int, mask: int=-1) -> str:
+    '''
+    ({src} >> 7 & 0x1f)
+    '''
+    if offset:
+        src = f'{src} >> {offset}'
+    if mask==-1:
+        return src
+    return f'({src} & {hex(mask)})'
+
+def src_uint(offset: int, mask: int, word_size: int=0) -> str:
+    '''return source code for a uint field, the same code as cst_source_code(cst_uint(offset, mask, word_size))
+    but assembled directly as a string, which is much faster than building and printing a cst
+
+    example: (n[5] >> 7 & 0x3f)
+    '''
+
+    if word_size:
+        if mask > 2**word_size-1:
+            raise ValueError('Expression not supported: field expression exceeds word_size')
+
+        j = offset // word_size
+        k = offset % word_size
+        m1 = mask >> word_size*(j+1)-offset
+
+        if m1: # span two words, word j holds the low bits
+            return src_shift_and(f'(n[{j}] >> {k} | n[{j+1}] << {word_size-k})', 0, mask)
+
+        return src_shift_and(f'n[{j}]', k, mask)
+    else:
+        return src_shift_and('n', offset, mask)
+
+def src_expr(expr: str, resolver: Callable[[str], str]) -> str:
+    '''return source code for an expression
+
+    :param expr: expression in field namespace to be translated
+    :param resolver: callback function to evaluate a name (e.g. 'a' or 'parrot.status') as source code
+
+    names are replaced in place, so the rest of expr keeps its formatting (like cst_expr)
+    '''
+    lines = io.StringIO(expr).readline
+    toks = [t for t in tokenize.generate_tokens(lines) if t.type not in (tokenize.NL, tokenize.NEWLINE, tokenize.ENDMARKER)]
+
+    line_starts = [0, 0] # tokenize rows start at 1
+    for line in expr.splitlines(keepends=True):
+        line_starts.append(line_starts[-1] + len(line))
+
+    parts = []
+    pos = 0
+    i = 0
+    while i < len(toks):
+        t = toks[i]
+        if t.type == tokenize.NAME and not keyword.iskeyword(t.string) and not (i and toks[i-1].string == '.'):
+            j = i # extend to a dotted name
+            while j+2 < len(toks) and toks[j+1].string == '.' and toks[j+2].type == tokenize.NAME:
+                j += 2
+            start = line_starts[t.start[0]] + t.start[1]
+            parts.append(expr[pos:start])
+            parts.append(resolver(''.join(t.string for t in toks[i:j+1])))
+            pos = line_starts[toks[j].end[0]] + toks[j].end[1]
+            i = j
+        i += 1
+    parts.append(expr[pos:])
+    return ''.join(parts)
+
 def is_identifier(expr):
-    cst = parse_expression(expr)
-    return isinstance(cst, Name)
+    return expr.isidentifier() and not keyword.iskeyword(expr)
 
 
-def cst_source_code(cst: CSTNode) -> str:
+def cst_source_code(cst: 'CSTNode') -> str:
     '''return source code for a node'''
-    return Module(body=[cst]).code
+    import libcst
+    return libcst.Module(body=[cst]).code
 
 
 
@@ -13,6 +13,7 @@ class IntDuck:
     Integer behavior supercedes enum_ if defined, including ordering.
     Not suitable for floating point
     '''
+    __slots__ = ()
     n_: int
 
     def __index__(self):
@@ -123,6 +124,7 @@ class NumDuck(IntDuck):
     Not suitable for enums.
     '''
 
+    __slots__ = ()
     v_: float
 
     def __add__(self, other):
@@ -1,15 +1,22 @@
 import os
+from functools import lru_cache
 from btypes import enum, uint, unbound_field, field
 
-from pyverilog.vparser.parser import parse
 
-filelist = ['example.v']
-
-os.environ['PYVERILOG_IVERILOG'] = r'C:\iverilog\bin\iverilog.exe'
-
-ast, directives = parse(filelist)
+@lru_cache(maxsize=None)
+def _parse(filelist:tuple) -> tuple:
+    from pyverilog.vparser.parser import parse # imported on first use, pyverilog is slow to load
+    return parse(list(filelist))
                         #preprocess_include=options.include,
                         #preprocess_define=options.define)
 
-ast.show()
+def parse_verilog(filelist:list, iverilog_path:str=None) -> tuple:
+    '''return (ast, directives) of the verilog files in filelist, parsed once per filelist'''
+    if iverilog_path:
+        os.environ['PYVERILOG_IVERILOG'] = iverilog_path
+    return _parse(tuple(filelist))
+
 
+if __name__ == '__main__':
+    ast, directives = parse_verilog(['example.v'], r'C:\iverilog\bin\iverilog.exe')
+    ast.show()
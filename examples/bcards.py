@@ -8,22 +8,33 @@ https://github.com/kenseehart/btypes
 
 import random
 import unittest
+from functools import lru_cache
 
-from btypes import enum, uint, unbound_field, field
+from btypes import enum, uint, bslice, unbound_field, field
+
+try:
+    import numpy # optional, see shuffle_many
+    _rng = numpy.random.default_rng() # PCG64, permutes in C
+except ImportError:
+    numpy = None
+
+_RANKS = '23456789TJQKA'
+_SUITS = 'CHDS'
+_CARDS = tuple(r+s for r in _RANKS for s in _SUITS) # card names in card number order, '2C' .. 'AS'
 
 class _card_t(uint):
     '''playing card'''
 
     def __init__(self):
-        super().__init__(6, enum((r+s for r in '23456789TJQKA' for s in 'CHDS')))
+        super().__init__(6, enum(_CARDS))
+        # built once, allocate_ runs for every card of every deck
+        self.fields_ = (('rank', uint(4, enum(_RANKS))),
+                        ('suit', uint(2, enum(_SUITS))),
+                        )
 
     def allocate_(self, name:str, parent=None, offset:int=0) -> unbound_field:
         '''allocate a field recursively'''
         ftype = super().allocate_(name, parent, offset)
-        
-        self.fields_ = (('rank', uint(4, enum('23456789TJQKA'))),
-                        ('suit', uint(2, enum('CHDS'))),
-                        )
         z = offset
 
         for fname, ft in reversed(self.fields_):
@@ -36,17 +47,71 @@ card = _card_t()
 
 
 def shuffle(cards:field) -> None:
-    a = list(map(int, cards))
+    a = cards.ns_ # raw card numbers decoded at once, list(map(int, cards)) would bind a field per card
     random.shuffle(a)
     # Naive in place sort, random.shuffle(deck), will not work correctly due to indirect reference of card fields.
     cards.v_ = a
 
+def shuffle_many(decks:list) -> None:
+    '''shuffle each of many decks (or hands) of equal length, with one numpy permutation of all of them
+    requires numpy: pip install numpy
+    '''
+    if numpy is None:
+        raise ImportError('shuffle_many requires numpy: pip install numpy')
+    a = numpy.array([d.ns_ for d in decks], dtype=numpy.uint8)
+    _rng.permuted(a, axis=1, out=a) # each row independently
+    for d, row in zip(decks, a.tolist()):
+        d.v_ = row
+
 def sort(cards:field) -> None:
-    cards.v_ = sorted(map(int, cards))
+    cards.v_ = sorted(cards.ns_)
+
+@lru_cache(maxsize=None)
+def _lanes(k:int) -> int:
+    '''1 in the lowest bit of each of k cards'''
+    return sum(1 << (card.size_*i) for i in range(k))
+
+def _any_lane(cards:field, z:int, size:int, v:int) -> bool:
+    '''True if the size bits at z of any card in cards equal v, tested on all cards at once (SWAR)'''
+    if isinstance(cards.btype_, bslice): # e.g. deck[5:10], whose cards are not packed in its n_
+        cards = card[len(cards)](cards.ns_)
+    ones = _lanes(len(cards))
+    y = (cards.n_ ^ (ones * (v << z))) & (ones * (((1<<size)-1) << z)) # lanes equal to v are now 0
+    return (y - (ones << z)) & ~y & (ones << (z+size-1)) != 0 # a 0 lane borrows into its top bit
+
+def has_rank(cards:field, rank:str) -> bool:
+    '''True if any card in cards has rank, e.g. has_rank(hand, 'A')'''
+    return _any_lane(cards, 2, 4, _RANKS.index(rank))
+
+def has_suit(cards:field, suit:str) -> bool:
+    '''True if any card in cards has suit, e.g. has_suit(hand, 'H')'''
+    return _any_lane(cards, 0, 2, _SUITS.index(suit))
     
     
 class BCardsTest(unittest.TestCase):
 
+    def test_has_rank_suit(self):
+        for _ in range(200):
+            k = random.randint(1, 52)
+            hand = card[k]([random.randrange(52) for _ in range(k)])
+            for r in '23456789TJQKA':
+                self.assertEqual(has_rank(hand, r), any(c.rank == r for c in hand))
+            for s in 'CHDS':
+                self.assertEqual(has_suit(hand, s), any(c.suit == s for c in hand))
+        hand = card[52](range(52))[0:8:2] # 2C 2D 3C 3D
+        self.assertTrue(has_rank(hand, '3'))
+        self.assertFalse(has_rank(hand, '4'))
+        self.assertTrue(has_suit(hand, 'D'))
+        self.assertFalse(has_suit(hand, 'H'))
+
+    @unittest.skipIf(numpy is None, 'requires numpy')
+    def test_shuffle_many(self):
+        decks = [card[52](range(52)) for _ in range(20)]
+        shuffle_many(decks)
+        for d in decks:
+            self.assertEqual(sorted(d.ns_), list(range(52)))
+        self.assertGreater(len(set(d.n_ for d in decks)), 1)
+
     def test_deck(self):
         
         deck = card[52](range(52))
@@ -2,6 +2,11 @@ from typing import Sequence
 from random import randint
 from btypes import uint, metastruct
 
+try:
+    import numpy # optional, see look_for_fives_batch
+except ImportError:
+    numpy = None
+
 class MyRegister(metaclass=metastruct):
     rtype: uint(2, enum_={'grail':0, 'shrubbery':1, 'meaning':2, 'larch':3, 'gourd':4})
     stuff: uint(3)
@@ -18,13 +23,12 @@ def datastream():
     yield randint(0,(1<<MyProtocol.size_)-1)
 
 def look_for_fives(datastream: Sequence[int]):
-    buffer = MyProtocol() # allocation of bit fields happens here, outside the loop
-    bstuff = buffer.b.stuff # optimization: do attribute access outside loop
+    bstuff = MyProtocol().b.stuff # allocation of bit fields happens here, outside the loop
+    shift, mask = bstuff.offset_, bstuff.mask_ # where b.stuff sits in the raw record, fixed once allocated
     hits = []
 
     for i, n in enumerate(datastream()): # iterate data source as sequence of abitrarily sized integers
-        buffer.n_ = n # put the next block of data in the buffer
-        if bstuff==5: # check if buffer.b.stuff == 5, this reduces to a simple shift-and operation with negligible overhead
+        if (n >> shift) & mask == 5: # buffer.b.stuff == 5 on the raw record, without assigning it to a buffer
             hits.append(i)
 
         if i==100:
@@ -32,5 +36,17 @@ def look_for_fives(datastream: Sequence[int]):
 
     return hits
 
+def datastream_batch(n: int=4096):
+  rng = numpy.random.default_rng()
+  while(1):
+    yield rng.integers(0, 1<<MyProtocol.size_, size=n, dtype=numpy.uint64) # a block of n records
+
+def look_for_fives_batch(records: 'numpy.ndarray') -> list:
+    '''look_for_fives over a numpy array of records, b.stuff of every record is one vectorized shift and mask'''
+    stuff = MyProtocol().vmap_(records, 'b.stuff') # the closed form expression of b.stuff, evaluated on the whole array
+    return numpy.flatnonzero(stuff == 5).tolist()
+
 print(look_for_fives(datastream))
+if numpy is not None:
+    print(look_for_fives_batch(next(datastream_batch(101))))
 
@@ -1,5 +1,8 @@
+from pathlib import Path
 from setuptools import setup
 
+README = (Path(__file__).parent / 'README.md').read_text(encoding='utf-8') # found from any working directory, and closed after reading
+
 setup(
     name='btypes',
     version='0.1.1',
@@ -9,8 +12,10 @@ setup(
     url='https://github.com/kenseehart/btypes',
     license='LICENSE',
     description='A framework for structured bitfield processing',
-    long_description=open('README.md').read(),
-    install_requires=[
-        "libcst",
-    ],
+    long_description=README,
+    long_description_content_type='text/markdown',
+    extras_require={
+        "cst": ["libcst"], # only for cst_, see btypes.expressions
+        "numpy": ["numpy"], # only for decode_batch_, view_soa_, vn_ and examples.bcards.shuffle_many
+    },
 )